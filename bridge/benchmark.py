@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Bridge benchmark: /find-images and /place-images against the simulated Resolve
+Generates synthetic image folders, runs each scenario in-process and reports
+wall time, Resolve API calls, peak memory and clips/sec. Results are written
+as JSON; pass --baseline to fail when a scenario got slower or chattier.
+
+    python benchmark.py
+    python benchmark.py --sizes 100,1000 --latency 0.2 --output before.json
+    python benchmark.py --baseline before.json
+    python benchmark.py --sizes 1000 --unbatched
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+
+os.environ['DAVINCI_BRIDGE_SIMULATE'] = '1'
+# Journals and conformed copies go to a scratch dir: every run writes journals,
+# and pruning them must never touch the user's resumable ones
+os.environ['LOCALAPPDATA'] = os.path.join(tempfile.gettempdir(), 'davinci_bridge_bench', 'appdata')
+
+import davinci_bridge
+import folder_index
+import resolve_sim
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Seconds of timeline per image
+CLIP_SECONDS = 4
+
+# /status poll interval for the status-under-load scenario
+STATUS_POLL_INTERVAL = 0.02
+
+# --unbatched: /place-images settings that make one Resolve call per file,
+# the way imports and placement were done before batching
+UNBATCHED_SCENARIOS = {
+    'import-per-file': {'importBatchSize': 1},
+    'append-per-clip': {'placementBatchSize': 1},
+}
+
+
+def _png(nr):
+    """Small valid PNG, unique per NR (widths vary so sizes mostly differ)"""
+    width, height = 8 + nr % 61, 8
+    row = b'\x00' + bytes((nr % 256, nr // 256 % 256, 128)) * width
+    data = zlib.compress(row * height)
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', data)
+            + chunk(b'IEND', b''))
+
+
+def make_folder(data_dir, size):
+    """Folder of size NNN_bench.png images (plus a few non-images), reused if present"""
+    folder = os.path.join(data_dir, f'bench_{size}')
+    marker = os.path.join(folder, '.complete')
+    if not os.path.exists(marker):
+        os.makedirs(folder, exist_ok=True)
+        for nr in range(1, size + 1):
+            with open(os.path.join(folder, f'{folder_index.format_nr(nr)}_bench.png'), 'wb') as f:
+                f.write(_png(nr))
+        for name in ('notes.txt', 'thumbs.db', 'readme.md'):
+            open(os.path.join(folder, name), 'w').close()
+        open(marker, 'w').close()
+    return folder
+
+
+def _clock(seconds):
+    return f'{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+
+
+def fresh_resolve(latency):
+    """New simulated project with zeroed call counters"""
+    resolve_sim.configure(latency_scale=latency)
+    davinci_bridge.session.invalidate()
+
+
+def measure(name, size, func, memory):
+    """Run func() once; returns the result row for this scenario"""
+    resolve_sim.simulator.calls.clear()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    response = func()
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
+    if memory:
+        tracemalloc.stop()
+
+    calls = dict(resolve_sim.simulator.calls)
+    row = {
+        'scenario': name,
+        'size': size,
+        'wallSeconds': round(wall, 4),
+        'clipsPerSecond': round(size / wall, 1) if wall else None,
+        'apiCalls': sum(calls.values()),
+        'apiCallsByMethod': dict(sorted(calls.items())),
+        'peakMemoryMB': round(peak / 1048576, 2) if memory else None,
+    }
+    if isinstance(response, dict) and response.get('success') is False:
+        row['error'] = response.get('message')
+    return row
+
+
+def run_size(client, data_dir, size, latency, memory, unbatched=False):
+    folder = make_folder(data_dir, size)
+    nr_list = list(range(1, size + 1))
+    rows = []
+
+    def find_images():
+        return client.post('/find-images', json={'path': folder, 'nrList': nr_list}).json
+
+    folder_index.invalidate()
+    rows.append(measure('find-images-cold', size, find_images, memory))
+    rows.append(measure('find-images-warm', size, find_images, memory))
+
+    mappings = find_images()['mappings']
+    for i, mapping in enumerate(mappings):
+        mapping['timestamp'] = f'{_clock(i * CLIP_SECONDS)}-{_clock((i + 1) * CLIP_SECONDS)}'
+
+    def place_images(settings=None):
+        return client.post('/place-images', json={'mappings': mappings, 'settings': settings or {}}).json
+
+    fresh_resolve(latency)
+    rows.append(measure('place-images', size, place_images, memory))
+    rows.append(measure('place-images-rerun', size, place_images, memory))
+    if unbatched:
+        for name, settings in UNBATCHED_SCENARIOS.items():
+            fresh_resolve(latency)
+            rows.append(measure(name, size, lambda: place_images(settings), memory))
+    return rows
+
+
+def status_under_load(client, data_dir, size, latency):
+    """/status latency while a placement of size images is running"""
+    folder = make_folder(data_dir, size)
+    mappings = client.post('/find-images', json={'path': folder, 'nrList': list(range(1, size + 1))}).json['mappings']
+    for i, mapping in enumerate(mappings):
+        mapping['timestamp'] = f'{_clock(i * CLIP_SECONDS)}-{_clock((i + 1) * CLIP_SECONDS)}'
+
+    fresh_resolve(latency)
+    client.get('/status')
+    placement = threading.Thread(
+        target=lambda: client.post('/place-images', json={'mappings': mappings, 'settings': {}})
+    )
+    placement.start()
+    latencies = []
+    while placement.is_alive():
+        start = time.perf_counter()
+        client.get('/status')
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(STATUS_POLL_INTERVAL)
+    placement.join()
+
+    latencies.sort()
+    return {
+        'scenario': 'status-under-load',
+        'size': size,
+        'samples': len(latencies),
+        'p50Ms': round(statistics.median(latencies), 2) if latencies else None,
+        'p99Ms': round(latencies[int(len(latencies) * 0.99)], 2) if latencies else None,
+        'maxMs': round(latencies[-1], 2) if latencies else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for rows slower (or making more API calls) than the baseline"""
+    before = {(row['scenario'], row['size']): row for row in baseline['results']}
+    regressions = []
+    for row in results:
+        old = before.get((row['scenario'], row['size']))
+        if not old:
+            continue
+        for field in ('wallSeconds', 'apiCalls', 'p99Ms'):
+            if old.get(field) and row.get(field) is not None and row[field] > old[field] * (1 + tolerance):
+                regressions.append(f"{row['scenario']} @ {row['size']}: {field} {old[field]} -> {row[field]}")
+    return regressions
+
+
+def print_row(row):
+    if row['scenario'] == 'status-under-load':
+        print(f"  {row['scenario']:<20} {row['size']:>6}  /status p50 {row['p50Ms']}ms  p99 {row['p99Ms']}ms  max {row['maxMs']}ms")
+        return
+    memory = f"{row['peakMemoryMB']:>8.1f}MB" if row['peakMemoryMB'] is not None else ''
+    print(f"  {row['scenario']:<20} {row['size']:>6}  {row['wallSeconds']:>8.3f}s  "
+          f"{row['clipsPerSecond']:>10.1f} clips/s  {row['apiCalls']:>7} API calls {memory}"
+          + (f"  ERROR: {row['error']}" if 'error' in row else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the bridge against the simulated Resolve API')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated image counts (default: 100,1000,10000)')
+    parser.add_argument('--latency', type=float, default=1.0,
+                        help='Simulated API latency scale (0 = instant)')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'davinci_bridge_bench'),
+                        help='Where synthetic image folders are generated (kept between runs)')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip tracemalloc (peak memory) for slightly more accurate timings')
+    parser.add_argument('--status-load-size', type=int, default=1000,
+                        help='Placement size for the /status-under-load scenario (0 to skip)')
+    parser.add_argument('--unbatched', action='store_true',
+                        help='Also place with one Resolve call per file, to compare against batching (slow)')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown vs. the baseline before failing (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    client = davinci_bridge.app.test_client()
+    results = []
+
+    # Measure steady state, not the deferred imports
+    davinci_bridge.warm_up().join()
+
+    print(f"Benchmarking sizes {sizes} (latency x{args.latency:g})")
+    for size in sizes:
+        for row in run_size(client, args.data_dir, size, args.latency, not args.no_memory, args.unbatched):
+            print_row(row)
+            results.append(row)
+    if args.status_load_size:
+        row = status_under_load(client, args.data_dir, args.status_load_size, args.latency)
+        print_row(row)
+        results.append(row)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'latencyScale': args.latency,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
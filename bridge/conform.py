@@ -0,0 +1,163 @@
+"""
+Conform stage: downscale, letterbox or convert stills before import
+Work runs on a process pool and lands in a cache directory keyed by a hash
+of the source content and the target settings, so re-runs reuse it. The
+cache is capped in size and evicts least recently used files first.
+Cached files are the live media of the clips imported from them, so files
+the media pool still uses are never evicted.
+"""
+
+import concurrent.futures
+import os
+import tempfile
+import threading
+
+import content_hash
+import lazy_import
+import resolve_batch
+
+# Pillow is optional (the conform stage is unavailable without it) and only
+# imported once a run asks for conforming
+pil_image = lazy_import.LazyModule('PIL.Image')
+
+CACHE_DIR = os.path.join(
+    os.getenv('LOCALAPPDATA', tempfile.gettempdir()),
+    'DaVinciBridge',
+    'conform'
+)
+DEFAULT_MAX_CACHE_MB = 4096
+
+# Formats/modes Resolve imports slowly or renders wrong
+CONVERT_FORMATS = ('WEBP', 'BMP', 'TIFF')
+CONVERT_MODES = ('CMYK', 'P', 'LA')
+
+# Bumped whenever conform output changes, so old cache entries are ignored
+CONFORM_VERSION = 1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count() or 2)
+        return _pool
+
+
+def needs_conform(probe, width, height, fit):
+    """Decide from a preflight probe whether a still has to be rewritten"""
+    if not probe or not probe.get('ok'):
+        return False
+    if probe['format'] in CONVERT_FORMATS or probe['mode'] in CONVERT_MODES:
+        return True
+    if probe['width'] > width or probe['height'] > height:
+        return True
+    # Letterboxing also pads stills whose aspect ratio differs from the timeline
+    if fit == 'letterbox' and probe['width'] * height != probe['height'] * width:
+        return True
+    return False
+
+
+def _conform_one(source, target, width, height, fit):
+    """Worker (runs in a pool process): write the conformed copy of source"""
+    Image = pil_image.get()
+    has_alpha = target.endswith('.png')
+    with Image.open(source) as image:
+        # JPEGs can decode straight at 1/2, 1/4 or 1/8 size, far cheaper than a full decode
+        image.draft('RGB', (width, height))
+        image.load()
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        scale = min(width / image.width, height / image.height, 1.0)
+        if scale < 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+        if fit == 'letterbox' and image.size != (width, height):
+            canvas = Image.new(image.mode, (width, height), (0, 0, 0, 0) if has_alpha else (0, 0, 0))
+            canvas.paste(image, ((width - image.width) // 2, (height - image.height) // 2))
+            image = canvas
+
+        partial = target + '.part'
+        if has_alpha:
+            image.save(partial, 'PNG', compress_level=1)
+        else:
+            image.save(partial, 'JPEG', quality=95, subsampling=0)
+        os.replace(partial, target)
+    return target
+
+
+def conform_paths(probes, width, height, fit='fit', cache_dir=CACHE_DIR, max_cache_mb=DEFAULT_MAX_CACHE_MB,
+                  in_use=()):
+    """
+    Conform every file that needs it
+    probes: {path: preflight result}. Returns ({path: path to import}, errors)
+    where files that didn't need conforming map to themselves. in_use holds
+    path keys of files media pool clips point at; eviction skips them and
+    everything returned here.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    result = {}
+    errors = {}
+    pending = {}
+
+    for path, probe in probes.items():
+        if not needs_conform(probe, width, height, fit):
+            result[path] = path
+            continue
+        has_alpha = probe['mode'] in ('RGBA', 'LA', 'P')
+        key = f"{content_hash.file_hash(path)}-{width}x{height}-{fit}-v{CONFORM_VERSION}"
+        target = os.path.join(cache_dir, key + ('.png' if has_alpha else '.jpg'))
+        if os.path.exists(target):
+            os.utime(target)  # mark as recently used
+            result[path] = target
+        else:
+            pending[path] = target
+
+    if pending:
+        pool = _get_pool()
+        futures = {
+            pool.submit(_conform_one, path, target, width, height, fit): path
+            for path, target in pending.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                result[path] = future.result()
+            except Exception as e:
+                errors[path] = f'Conform failed: {e}'
+        keep = set(in_use)
+        keep.update(resolve_batch.path_key(target) for target in result.values())
+        evict(cache_dir, max_cache_mb, keep)
+
+    return result, errors
+
+
+def evict(cache_dir=CACHE_DIR, max_cache_mb=DEFAULT_MAX_CACHE_MB, keep=()):
+    """Delete least recently used cache files until the cache fits the cap
+
+    Files whose path key is in keep are counted but never deleted, so the
+    cache can stay over the cap while clips still use them.
+    """
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as scan:
+        for entry in scan:
+            if entry.is_file() and not entry.name.endswith('.part'):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+    limit = max_cache_mb * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        if resolve_batch.path_key(path) in keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
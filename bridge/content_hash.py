@@ -0,0 +1,76 @@
+"""
+Content hashing for import de-duplication
+Files are only hashed when another file of the same size turns up, and a
+hash is remembered while the file's size and mtime stay the same, so most
+runs hash few or no files at all
+"""
+
+import hashlib
+import os
+import threading
+
+# Bytes read per update() call
+READ_BLOCK = 1024 * 1024
+
+# Remembered hashes, oldest dropped first
+MAX_CACHE_ENTRIES = 50000
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def file_hash(path, st=None):
+    """BLAKE2b digest of a file's content, cached by (path, size, mtime)"""
+    st = st or os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+
+    with _cache_lock:
+        _cache[key] = value
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+    return value
+
+
+class ContentIndex:
+    """Maps each distinct file content to the first path seen with it"""
+
+    def __init__(self):
+        # size -> paths not hashed yet, or None once every file of that size is hashed
+        self._by_size = {}
+        self._by_hash = {}
+
+    def _hash_into(self, path, st=None):
+        return self._by_hash.setdefault(file_hash(path, st), path)
+
+    def add(self, path):
+        """Register a file; returns the path of identical content seen first
+        (path itself if the content is new or the file can't be read)"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return path
+
+        pending = self._by_size.get(st.st_size, [])
+        if pending == []:
+            # First file of this size can't be a duplicate yet; hash it lazily
+            self._by_size[st.st_size] = [path]
+            return path
+
+        try:
+            if pending is not None:
+                for earlier in pending:
+                    self._hash_into(earlier)
+                self._by_size[st.st_size] = None
+            return self._hash_into(path, st)
+        except OSError:
+            return path
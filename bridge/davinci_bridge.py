@@ -4,12 +4,61 @@ DaVinci Resolve Bridge Server
 Auto-started by Next.js app to communicate with DaVinci Resolve
 """
 
-from flask import Flask, request, jsonify
+import socket
+import sys
+import time
+
+# Taken before anything else is imported, for --measure-startup
+STARTED_AT = time.perf_counter()
+
+# Ports the bridge tries, in order
+BRIDGE_PORTS = range(8765, 8775)
+
+
+def bind_listener(ports=BRIDGE_PORTS):
+    """Listening socket on the first free port, or None if all are taken"""
+    for port in ports:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if sys.platform != 'win32':
+            # Ignore TIME_WAIT leftovers from a previous run (on Windows this would allow port sharing)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(('localhost', port))
+            sock.listen(128)
+            return sock
+        except OSError:
+            sock.close()
+    return None
+
+
+# Run as the server, listen before Flask (the slowest import) loads, so the
+# Next.js app's first /status is queued instead of refused
+early_listener = bind_listener() if __name__ == '__main__' and '--dev' not in sys.argv else None
+LISTENING_AT = time.perf_counter()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
-import sys
-import glob
+import json
 import re
+import threading
+import uuid
+
+import events
+import folder_index
+import folder_picker
+import jobs
+import journal
+import lazy_import
+import manifest
+import metrics
+import placement
+import preflight
+import profiling
+import resolve_executor
+import resolve_session
+import status_poller
+import timecode
 
 # Setup paths for DaVinci Resolve API
 RESOLVE_SCRIPT_API = os.path.join(
@@ -23,86 +72,223 @@ RESOLVE_SCRIPT_API = os.path.join(
 
 sys.path.append(os.path.join(RESOLVE_SCRIPT_API, 'Modules'))
 
-try:
-    import DaVinciResolveScript as dvr
-    RESOLVE_AVAILABLE = True
-except ImportError:
-    RESOLVE_AVAILABLE = False
-    print("WARNING: DaVinci Resolve API not found")
-    print(f"Expected location: {RESOLVE_SCRIPT_API}")
+# DAVINCI_BRIDGE_SIMULATE=1 (or --simulate) swaps in the built-in simulator
+SIMULATED = bool(os.getenv('DAVINCI_BRIDGE_SIMULATE'))
+
 
-# Try to import tkinter for folder picker
+def _import_resolve():
+    if SIMULATED:
+        import resolve_sim
+        return resolve_sim
+    try:
+        import DaVinciResolveScript
+    except ImportError:
+        print("WARNING: DaVinci Resolve API not found")
+        print(f"Expected location: {RESOLVE_SCRIPT_API}")
+        raise
+    return DaVinciResolveScript
+
+
+# DaVinciResolveScript loads fusionscript, so it is imported on the warm-up
+# thread (or first use) while the server already answers
+resolve_api = lazy_import.LazyModule(_import_resolve)
+
+# Production WSGI server (optional, falls back to werkzeug's threaded server)
 try:
-    import tkinter as tk
-    from tkinter import filedialog
-    TKINTER_AVAILABLE = True
+    import waitress
+    WAITRESS_AVAILABLE = True
 except ImportError:
-    TKINTER_AVAILABLE = False
-    print("WARNING: tkinter not available, folder picker disabled")
+    WAITRESS_AVAILABLE = False
+
+# One Resolve connection shared by every request; API calls are timed for /metrics
+def connect_resolve():
+    dvr = resolve_api.get()
+    return metrics.instrument(dvr.scriptapp("Resolve")) if dvr else None
+
+
+session = resolve_session.ResolveSession(connect_resolve)
+
+
+def resolve_available():
+    """Whether the Resolve API can be used, loading it on the executor if warm-up hasn't yet"""
+    if not resolve_api.loaded:
+        # Never on a request thread: fusionscript belongs to the executor thread
+        resolve_executor.run(resolve_api.get)
+    return resolve_api.available
 
 app = Flask(__name__)
 CORS(app)  # Allow requests from Next.js
 
 
-@app.route('/status')
-def status():
-    """Check if bridge is running and DaVinci is connected"""
+def read_status():
+    """Query Resolve for bridge status (polled in the background)"""
     status_data = {
         'bridgeRunning': True,
-        'resolveAvailable': RESOLVE_AVAILABLE,
+        'resolveAvailable': None,
         'resolveConnected': False,
         'project': None,
         'timeline': None
     }
     
-    if not RESOLVE_AVAILABLE:
-        return jsonify(status_data)
+    if not resolve_api.loaded:
+        # Answer right away; the warm-up thread pokes the poller once loaded
+        warm_up()
+        status_data['warmingUp'] = True
+        return status_data
+    
+    status_data['resolveAvailable'] = resolve_api.available
+    if not resolve_api.available:
+        return status_data
     
     try:
-        resolve = dvr.scriptapp("Resolve")
-        if not resolve:
-            return jsonify(status_data)
-        
-        project_manager = resolve.GetProjectManager()
-        project = project_manager.GetCurrentProject()
-        
-        if project:
-            status_data['resolveConnected'] = True
-            status_data['project'] = project.GetName()
-            
-            timeline = project.GetCurrentTimeline()
-            if timeline:
-                status_data['timeline'] = timeline.GetName()
-                status_data['fps'] = timeline.GetSetting('timelineFrameRate')
-        
+        status_data.update(resolve_executor.run(session.info, max_age=0))
     except Exception as e:
         print(f"Error checking Resolve status: {e}")
     
-    return jsonify(status_data)
+    return status_data
+
+
+# Background refresh so /status never waits on Resolve
+poller = status_poller.StatusPoller(
+    read_status,
+    lambda state: state['resolveConnected']
+)
+
+# Placement runs submitted via /jobs/place
+job_runner = jobs.JobRunner()
+
+# Per-clip progress for /events subscribers
+event_bus = events.EventBus()
+
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+
+
+def warm_up():
+    """Import the Resolve API and NumPy on a background thread (once)"""
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_warm_up, name='warm-up', daemon=True)
+            _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def _warm_up():
+    # fusionscript is loaded on the thread that makes every other Resolve call
+    resolve_executor.run(resolve_api.get)
+    poller.poke()
+    if not SIMULATED:
+        print(f"DaVinci API: {'✓ Available' if resolve_api.available else '✗ Not Found'} ({resolve_api.load_ms}ms)")
+    timecode.numpy_module.get()
+
+# Worker threads for the production server
+DEFAULT_SERVER_THREADS = 16
+
+# Longest a ?since= long-poll may block, in seconds
+MAX_LONG_POLL = 30.0
+
+# Scrape-time gauges for /metrics
+metrics.registry.register(metrics.Gauge(
+    'bridge_jobs', 'Placement jobs by status', ('status',),
+    lambda: {(status,): count for status, count in job_runner.status_counts().items()}
+))
+metrics.registry.register(metrics.Gauge(
+    'bridge_resolve_queue_depth', 'Resolve commands waiting for the executor thread', (),
+    lambda: {(): resolve_executor.queue_depth()}
+))
+
+
+def request_profile():
+    """RequestProfile when the request asked for ?profile=1 (&top=N for cProfile stats)"""
+    if request.args.get('profile', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    return profiling.RequestProfile(top=request.args.get('top', 0, type=int))
+
+
+def profiled_json(result, profile):
+    """jsonify(result), with the profile (including serialization time) attached"""
+    if not profile:
+        return jsonify(result)
+    
+    profile.set_phase('serialize')
+    body = json.dumps(result)
+    result_profile = json.dumps(profile.to_dict())
+    body = body[:-1] + (', ' if len(body) > 2 else '') + '"profile": ' + result_profile + '}'
+    return Response(body, mimetype='application/json')
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    metrics.http_in_flight.inc()
+
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def record_request_metrics(exc):
+    if 'request_start' not in g:
+        return
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.http_in_flight.dec()
+    metrics.http_duration.observe(time.perf_counter() - g.request_start, endpoint, request.method)
+    metrics.http_requests.inc(endpoint, request.method, str(g.get('response_status', 500)))
+
+
+@app.route('/status')
+def status():
+    """Check if bridge is running and DaVinci is connected
+    
+    Returns the poller's cached snapshot. Pass ?since=<version> to block
+    until the state changes (up to ?timeout= seconds).
+    """
+    poller.start()
+    
+    since = request.args.get('since', type=int)
+    if since is None:
+        version, state, etag = poller.snapshot()
+        if request.if_none_match.contains(etag.strip('"')):
+            return '', 304, {'ETag': etag}
+    else:
+        timeout = request.args.get('timeout', MAX_LONG_POLL, type=float)
+        timeout = min(max(timeout, 0.0), MAX_LONG_POLL)
+        version, state, etag = poller.wait_for_change(since, timeout)
+    
+    response = jsonify(dict(state, version=version))
+    response.headers['ETag'] = etag
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics: request and Resolve call latency, clip counters, jobs"""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/browse-folder', methods=['POST'])
 def browse_folder():
-    """Open native Windows folder picker dialog"""
-    if not TKINTER_AVAILABLE:
-        return jsonify({
-            'success': False,
-            'message': 'Folder picker not available'
-        })
+    """Open native folder picker dialog
+    
+    The dialog runs in a helper process (folder_picker.py), so Tk gets its
+    own main thread; optional JSON body: {timeout, initialDir}. The chosen
+    folder is indexed in the background for the /find-images that follows.
+    """
+    data = request.get_json(silent=True) or {}
     
     try:
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes('-topmost', True)
-        
-        folder_path = filedialog.askdirectory(
-            title='Select Image Folder',
-            initialdir=os.path.expanduser('~\\Pictures')
+        folder_path = folder_picker.pick(
+            initial_dir=data.get('initialDir'),
+            timeout=float(data.get('timeout') or folder_picker.DEFAULT_TIMEOUT)
         )
         
-        root.destroy()
-        
         if folder_path:
+            threading.Thread(target=folder_index.get_index, args=(folder_path,),
+                             name='index-prefetch', daemon=True).start()
             return jsonify({
                 'success': True,
                 'path': folder_path
@@ -121,46 +307,74 @@ def browse_folder():
 
 @app.route('/find-images', methods=['POST'])
 def find_images():
-    """Find images by NR prefix (001_, 002_, etc.)"""
+    """Find images by NR prefix (001_, 002_, etc.)
+    
+    Body: path=<folder> or roots=[<folder>, ...] in priority order, plus
+    depth=<subfolder levels to search> (default 0, only the folders themselves).
+    When an NR has several files, variant=first|newest|largest picks one and
+    picks={nr: filename or path} overrides it; the rest are listed as
+    alternatives.
+    """
     data = request.json
-    folder_path = data.get('path')
+    roots = data.get('roots') or [data.get('path')]
     nr_list = data.get('nrList', [])
+    policy = data.get('variant') or 'first'
+    picks = {folder_index.format_nr(nr): pick for nr, pick in (data.get('picks') or {}).items()}
+    
+    if policy not in folder_index.VARIANT_POLICIES:
+        return jsonify({
+            'success': False,
+            'message': f'Invalid variant policy: {policy}'
+        })
     
-    if not os.path.exists(folder_path):
+    try:
+        depth = int(data.get('depth') or 0)
+    except (TypeError, ValueError):
         return jsonify({
             'success': False,
-            'message': f'Folder does not exist: {folder_path}'
+            'message': f'Invalid depth: {data.get("depth")}'
         })
     
+    for folder_path in roots:
+        if not folder_path or not os.path.isdir(folder_path):
+            return jsonify({
+                'success': False,
+                'message': f'Folder does not exist: {folder_path}'
+            })
+    
+    profile = request_profile()
+    if profile:
+        profile.set_phase('index')
+    
+    # One directory scan per folder (cached until the folder changes)
+    index = folder_index.get_merged_index(roots, depth)
+    
+    if profile:
+        profile.set_phase('lookup')
+    
     results = []
     found_count = 0
     missing = []
+    unmatched_picks = []
     
     for nr in nr_list:
-        # Format as 001, 002, 003, etc.
-        prefix = str(nr).zfill(3)
-        
-        # Look for any file starting with "001_"
-        # Support common image extensions
-        found = False
-        for ext in ['png', 'jpg', 'jpeg', 'webp', 'tiff', 'bmp']:
-            pattern = os.path.join(folder_path, f"{prefix}_*.{ext}")
-            matches = glob.glob(pattern)
-            
-            if matches:
-                # Found it! Use first match
-                filename = os.path.basename(matches[0])
-                results.append({
-                    'nr': nr,
-                    'found': True,
-                    'filename': filename,
-                    'fullPath': matches[0]
-                })
-                found_count += 1
-                found = True
-                break
+        pick = picks.get(folder_index.format_nr(nr))
+        match, variants = folder_index.resolve(index, nr, policy, pick)
         
-        if not found:
+        if match:
+            result = {
+                'nr': nr,
+                'found': True,
+                'filename': match.name,
+                'fullPath': match.path
+            }
+            if len(variants) > 1:
+                result['alternatives'] = folder_index.describe([v for v in variants if v is not match])
+            if pick and pick not in (match.name, match.path):
+                unmatched_picks.append(nr)
+            results.append(result)
+            found_count += 1
+        else:
             # Missing
             results.append({
                 'nr': nr,
@@ -170,167 +384,284 @@ def find_images():
             })
             missing.append(nr)
     
-    return jsonify({
+    return profiled_json({
         'success': True,
         'total': len(nr_list),
         'found': found_count,
         'missing': len(missing),
         'missingNumbers': missing,
+        'unmatchedPicks': unmatched_picks,
         'mappings': results
-    })
+    }, profile)
 
 
-def parse_timestamp(timestamp_str):
-    """Parse timestamp like '00:00' or '01:23:45' to seconds"""
-    parts = timestamp_str.strip().split(':')
-    if len(parts) == 2:  # MM:SS
-        m, s = int(parts[0]), int(parts[1])
-        return m * 60 + s
-    elif len(parts) == 3:  # HH:MM:SS
-        h, m, s = int(parts[0]), int(parts[1]), int(parts[2])
-        return h * 3600 + m * 60 + s
-    else:
-        return 0
+@app.route('/preflight', methods=['POST'])
+def preflight_images():
+    """Check image files (format, size, colour mode, corruption) without Resolve"""
+    data = request.json
+    mappings = [m for m in data.get('mappings', []) if m.get('found') and m.get('fullPath')]
+    
+    results = preflight.preflight([m['fullPath'] for m in mappings])
+    report = []
+    for mapping in mappings:
+        report.append(dict(results[mapping['fullPath']], nr=mapping.get('nr'), fullPath=mapping['fullPath']))
+    
+    failed = [entry['nr'] for entry in report if not entry['ok']]
+    return jsonify({
+        'success': True,
+        'checked': len(report),
+        'failed': len(failed),
+        'failedNumbers': failed,
+        'results': report
+    })
 
 
-def timestamp_to_frame(timestamp_str, fps):
-    """Convert timestamp to frame number"""
-    seconds = parse_timestamp(timestamp_str)
-    return int(seconds * fps)
+def run_placement(data, progress=None, run_id=None, profile=None):
+    """Run a placement, dropping the session if Resolve errors out
+    
+    profile (a profiling.RequestProfile) also serves as the progress sink
+    and wraps the run in cProfile when it asked for top-N stats. Streamed
+    manifests run on this thread, so the upload is read here and only the
+    Resolve work of each chunk occupies the executor.
+    """
+    run_id = run_id or uuid.uuid4().hex[:12]
+    
+    def emit(event_type, **fields):
+        event_bus.publish(event_type, run=run_id, **fields)
+    
+    mappings = data.get('mappings', [])
+    if data.get('timelines'):
+        mappings = [m for target in data['timelines'] for m in target.get('mappings', [])]
+    emit('run', phase='start', total=len(mappings) if isinstance(mappings, list) else None)
+    try:
+        if profile:
+            result = resolve_executor.run(profile.call, placement.run_placement, session, data, profile, emit, run_id)
+        elif not isinstance(mappings, list):
+            result = placement.run_placement(session, data, progress, emit, run_id)
+        else:
+            result = resolve_executor.run(placement.run_placement, session, data, progress, emit, run_id)
+    except Exception as e:
+        session.invalidate()
+        poller.poke()
+        result = {
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }
+        # What a crashed run got done is journaled; tell the caller what to resume
+        journal_id = (data.get('settings') or {}).get('resume') or run_id
+        if journal.run_exists(journal_id):
+            result['runId'] = journal_id
+    emit('run', phase='done', success=result['success'])
+    metrics.record_run(result)
+    return result
 
 
 @app.route('/place-images', methods=['POST'])
 def place_images():
     """Place images on DaVinci Resolve timeline"""
-    if not RESOLVE_AVAILABLE:
+    if not resolve_available():
         return jsonify({
             'success': False,
             'message': 'DaVinci Resolve API not available'
         })
     
-    data = request.json
-    mappings = data.get('mappings', [])
-    settings = data.get('settings', {})
+    profile = request_profile()
+    return profiled_json(run_placement(request.json, profile=profile), profile)
+
+
+@app.route('/place-manifest', methods=['POST'])
+def place_manifest():
+    """Place images from a CSV or NDJSON manifest streamed as the request body
     
-    fps = int(settings.get('fps', 24))
-    video_track = int(settings.get('videoTrack', 2))
+    Query: path=<image folder> (repeat for several roots, in priority order),
+    depth=<subfolder levels>, variant=first|newest|largest, format=csv|ndjson (default from the
+    Content-Type), settings=<JSON, same as /place-images settings>.
+    Rows are parsed, matched against the folder index and imported/placed
+    in chunks (overlapping the upload only where the server streams the
+    body; waitress buffers it first).
+    """
+    if not resolve_available():
+        return jsonify({
+            'success': False,
+            'message': 'DaVinci Resolve API not available'
+        })
     
-    try:
-        # Connect to Resolve
-        resolve = dvr.scriptapp("Resolve")
-        if not resolve:
-            return jsonify({
-                'success': False,
-                'message': 'Cannot connect to DaVinci Resolve. Make sure it is running.'
-            })
-        
-        project_manager = resolve.GetProjectManager()
-        project = project_manager.GetCurrentProject()
-        
-        if not project:
-            return jsonify({
-                'success': False,
-                'message': 'No project open in DaVinci Resolve'
-            })
-        
-        timeline = project.GetCurrentTimeline()
-        if not timeline:
+    roots = request.args.getlist('path')
+    for folder_path in roots:
+        if not os.path.isdir(folder_path):
             return jsonify({
                 'success': False,
-                'message': 'No timeline selected in DaVinci Resolve'
+                'message': f'Folder does not exist: {folder_path}'
             })
-        
-        media_pool = project.GetMediaPool()
-        root_folder = media_pool.GetRootFolder()
-        
-        # Create a folder for imported images
-        import_folder = media_pool.AddSubFolder(root_folder, "Imported_Images")
-        if not import_folder:
-            import_folder = root_folder
-        
-        media_pool.SetCurrentFolder(import_folder)
-        
-        # Import all images first
-        imported_items = {}
-        import_errors = []
-        
-        for mapping in mappings:
-            if not mapping.get('found'):
-                continue
-            
-            filepath = mapping.get('fullPath')
-            nr = mapping.get('nr')
-            
-            if not filepath or not os.path.exists(filepath):
-                import_errors.append(f"#{nr}: File not found")
-                continue
-            
-            # Import to media pool
-            items = media_pool.ImportMedia([filepath])
-            if items and len(items) > 0:
-                imported_items[nr] = items[0]
-            else:
-                import_errors.append(f"#{nr}: Failed to import {mapping.get('filename')}")
-        
-        # Place images on timeline
-        placed_count = 0
-        placement_errors = []
-        
-        for mapping in mappings:
-            nr = mapping.get('nr')
-            
-            if nr not in imported_items:
-                continue
-            
-            media_item = imported_items[nr]
-            timestamp = mapping.get('timestamp', '')
-            
-            # Parse timestamp range (e.g., "00:00-00:06")
-            if '-' in timestamp:
-                start_str, end_str = timestamp.split('-')
-                start_frame = timestamp_to_frame(start_str.strip(), fps)
-                end_frame = timestamp_to_frame(end_str.strip(), fps)
-                duration = end_frame - start_frame
-            else:
-                placement_errors.append(f"#{nr}: Invalid timestamp format")
-                continue
-            
-            # Place on timeline using AppendToTimeline
-            clip_info = {
-                "mediaPoolItem": media_item,
-                "startFrame": 0,
-                "endFrame": duration,
-                "trackIndex": video_track,
-                "recordFrame": start_frame
-            }
-            
-            result = media_pool.AppendToTimeline([clip_info])
-            
-            if result:
-                placed_count += 1
-            else:
-                placement_errors.append(f"#{nr}: Failed to place on timeline")
-        
+    depth = request.args.get('depth', 0, type=int)
+    policy = request.args.get('variant') or 'first'
+    if policy not in folder_index.VARIANT_POLICIES:
         return jsonify({
-            'success': True,
-            'imported': len(imported_items),
-            'placed': placed_count,
-            'total': len(mappings),
-            'importErrors': import_errors,
-            'placementErrors': placement_errors
+            'success': False,
+            'message': f'Invalid variant policy: {policy}'
         })
-        
-    except Exception as e:
+    
+    try:
+        settings = json.loads(request.args.get('settings') or '{}')
+    except ValueError as e:
         return jsonify({
             'success': False,
-            'message': f'Error: {str(e)}'
+            'message': f'Invalid settings: {e}'
+        })
+    
+    manifest_format = request.args.get('format') or (
+        'ndjson' if 'ndjson' in (request.content_type or '') else 'csv'
+    )
+    try:
+        if manifest_format == 'ndjson':
+            rows = manifest.iter_ndjson_rows(request.stream)
+        else:
+            rows = manifest.iter_csv_rows(request.stream)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': f'Invalid manifest: {e}'
         })
+    
+    missing = []
+    result = run_placement({
+        'mappings': manifest.resolve_rows(rows, roots, missing, depth, policy),
+        'settings': settings
+    })
+    if result['success']:
+        result['missing'] = len(missing)
+        result['missingNumbers'] = missing
+    return jsonify(result)
+
+
+@app.route('/jobs/place', methods=['POST'])
+def submit_place_job():
+    """Queue a placement run and return its job ID immediately"""
+    if not resolve_available():
+        return jsonify({
+            'success': False,
+            'message': 'DaVinci Resolve API not available'
+        })
+    
+    data = request.json
+    job = job_runner.submit('place', lambda job: run_placement(data, job, job.id))
+    return jsonify({
+        'success': True,
+        'jobId': job.id,
+        'job': job.to_dict()
+    }), 202
+
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Report phase, per-phase counts, throughput and ETA of a job"""
+    job = job_runner.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': f'Unknown job: {job_id}'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+
+@app.route('/journals')
+def list_journals():
+    """Placement journals on disk; unfinished ones can be resumed with settings.resume"""
+    return jsonify({
+        'success': True,
+        'journals': journal.list_journals()
+    })
+
+
+@app.route('/events')
+def stream_events():
+    """Server-Sent Events stream of imported/placed/failed/batch events
+    
+    ?run=<job id> limits the stream to one run. Reconnecting clients
+    resume from the Last-Event-ID header.
+    """
+    since = event_bus.parse_event_id(request.headers.get('Last-Event-ID'))
+    run = request.args.get('run')
+    return Response(
+        stream_with_context(events.stream(event_bus, since, run)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def create_server(listener, threads=DEFAULT_SERVER_THREADS):
+    """Threaded WSGI server on an already listening socket
+    
+    Requests are handled concurrently; anything touching Resolve is
+    serialized through resolve_executor.
+    """
+    if WAITRESS_AVAILABLE:
+        # Long-polls and /events streams each hold a thread
+        return waitress.create_server(app, sockets=[listener], threads=threads, ident='davinci-bridge')
+    from werkzeug.serving import make_server
+    host, port = listener.getsockname()[:2]
+    return make_server(host, port, app, threaded=True, fd=listener.fileno())
+
+
+def run_server(server):
+    if WAITRESS_AVAILABLE:
+        server.run()
+    else:
+        server.serve_forever()
+
+
+def measure_startup(port, imported_at):
+    """--measure-startup: time the first /status and the warm-up, print JSON, exit"""
+    import urllib.request
+    
+    with urllib.request.urlopen(f'http://localhost:{port}/status') as response:
+        first_status = json.load(response)
+    answered = time.perf_counter()
+    warm_up().join(timeout=30)
+    warmed = time.perf_counter()
+    
+    def ms(moment):
+        return round((moment - STARTED_AT) * 1000, 1)
+    
+    print(json.dumps({
+        'listenMs': ms(LISTENING_AT) if early_listener else None,
+        'importsMs': ms(imported_at),
+        'firstStatusMs': ms(answered),
+        'firstStatusWarmingUp': bool(first_status.get('warmingUp')),
+        'warmUpMs': ms(warmed),
+        'resolveImportMs': resolve_api.load_ms,
+        'numpyImportMs': timecode.numpy_module.load_ms
+    }))
+    os._exit(0)
 
 
 if __name__ == '__main__':
-    # Try to find an available port
-    import socket
+    imported_at = time.perf_counter()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='DaVinci Resolve Bridge Server')
+    parser.add_argument('--dev', action='store_true',
+                        help="Use Flask's development server instead of the production server")
+    parser.add_argument('--threads', type=int, default=DEFAULT_SERVER_THREADS,
+                        help='Worker threads for the production server')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Use the built-in Resolve simulator instead of DaVinci Resolve')
+    parser.add_argument('--sim-latency', type=float, default=1.0,
+                        help='Scale factor for simulated API latency (0 = instant)')
+    parser.add_argument('--measure-startup', action='store_true',
+                        help='Print startup timings as JSON once /status answers, then exit')
+    args = parser.parse_args()
+    
+    if args.simulate or SIMULATED:
+        import resolve_sim
+        resolve_sim.configure(latency_scale=args.sim_latency)
+        SIMULATED = True
     
+    # Try to find an available port
     def is_port_available(port):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             try:
@@ -339,30 +670,44 @@ if __name__ == '__main__':
             except OSError:
                 return False
     
-    port = 8765
-    if not is_port_available(port):
-        print(f"⚠️  Port {port} is already in use, trying alternate ports...")
-        for alt_port in range(8766, 8775):
-            if is_port_available(alt_port):
-                port = alt_port
-                break
-        else:
-            print("❌ Could not find available port between 8765-8774")
-            print("Please close other applications using these ports")
-            input("Press Enter to exit...")
-            sys.exit(1)
+    if args.dev:
+        port = next((p for p in BRIDGE_PORTS if is_port_available(p)), None)
+    else:
+        port = early_listener.getsockname()[1] if early_listener else None
+    
+    if port is None:
+        print("❌ Could not find available port between 8765-8774")
+        print("Please close other applications using these ports")
+        input("Press Enter to exit...")
+        sys.exit(1)
+    if port != BRIDGE_PORTS[0]:
+        print(f"⚠️  Port {BRIDGE_PORTS[0]} is already in use, using {port}")
+    
+    # Resolve API and NumPy load in the background from here on
+    warm_up()
+    if args.measure_startup:
+        threading.Thread(target=measure_startup, args=(port, imported_at), daemon=True).start()
     
     print("=" * 60)
     print("🎬 DaVinci Resolve Bridge Server")
     print("=" * 60)
     print(f"Status: Running on http://localhost:{port}")
-    print(f"DaVinci API: {'✓ Available' if RESOLVE_AVAILABLE else '✗ Not Found'}")
-    print(f"Folder Picker: {'✓ Available' if TKINTER_AVAILABLE else '✗ Not Available'}")
+    if SIMULATED:
+        print(f"DaVinci API: ⚙ Simulated (latency x{args.sim_latency:g})")
+    else:
+        print("DaVinci API: loading in the background (see /status)")
+    if args.dev:
+        print("Server: Flask development server")
+    else:
+        print(f"Server: {'waitress' if WAITRESS_AVAILABLE else 'werkzeug (threaded)'}, {args.threads} threads")
     print("=" * 60)
     print("\nWaiting for connections from Next.js app...\n")
     
     try:
-        app.run(host='localhost', port=port, debug=False)
+        if args.dev:
+            app.run(host='localhost', port=port, debug=False)
+        else:
+            run_server(create_server(early_listener, args.threads))
     except Exception as e:
         print(f"\n❌ Error starting server: {e}")
         print("\nTroubleshooting:")
@@ -0,0 +1,141 @@
+"""
+Placement event bus for the /events Server-Sent Events stream
+Publishing only appends to a ring buffer, so a slow or absent client can
+never hold up the Resolve calls that produce the events
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+# Events kept for clients that reconnect with Last-Event-ID
+BUFFER_SIZE = 5000
+
+# A client is sent at most one flush per interval
+FLUSH_INTERVAL = 0.1
+
+# Above this many events in one flush, per-clip events are merged by type
+COALESCE_THRESHOLD = 20
+
+# Comment line sent when nothing happened, keeps proxies from timing out
+HEARTBEAT_INTERVAL = 15.0
+
+# Client reconnect delay sent with the first chunk of every stream, in ms
+RECONNECT_MS = 3000
+
+PER_CLIP_EVENTS = ('imported', 'placed')
+
+
+class EventBus:
+    """Sequence-numbered ring buffer of small event dicts"""
+
+    def __init__(self, size=BUFFER_SIZE):
+        self._events = collections.deque(maxlen=size)
+        self._seq = 0
+        # Sequence numbers restart with the bridge, so SSE ids carry a boot id too
+        self.boot_id = os.urandom(4).hex()
+        self._cond = threading.Condition()
+
+    def publish(self, event_type, **fields):
+        with self._cond:
+            self._seq += 1
+            fields['type'] = event_type
+            fields['seq'] = self._seq
+            self._events.append(fields)
+            self._cond.notify_all()
+
+    def last_seq(self):
+        with self._cond:
+            return self._seq
+
+    def parse_event_id(self, event_id):
+        """Sequence number from a Last-Event-ID, or None if it came from another boot"""
+        boot_id, _, seq = (event_id or '').rpartition('-')
+        if boot_id != self.boot_id or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def read_since(self, seq, timeout):
+        """Wait up to timeout for events after seq; returns (events, dropped)"""
+        with self._cond:
+            if self._seq <= seq:
+                self._cond.wait(timeout)
+            if not self._events:
+                return [], 0
+            first = self._events[0]['seq']
+            dropped = max(0, first - seq - 1)
+            start = max(0, seq + 1 - first)
+            return list(self._events)[start:], dropped
+
+
+def coalesce(events):
+    """Merge per-clip events of the same run/type when a flush is large"""
+    if len(events) <= COALESCE_THRESHOLD:
+        return events
+
+    merged = []
+    groups = {}
+    for event in events:
+        if event['type'] not in PER_CLIP_EVENTS:
+            merged.append(event)
+            continue
+        key = (event.get('run'), event['type'])
+        group = groups.get(key)
+        if group is None:
+            group = {'type': event['type'], 'run': event.get('run'), 'nrs': [], 'count': 0}
+            groups[key] = group
+            merged.append(group)
+        group['nrs'].append(event.get('nr'))
+        group['count'] += 1
+        group['seq'] = event['seq']
+
+    # A merged group sits where its last event was, so ids stay increasing
+    merged.sort(key=lambda event: event['seq'])
+    return merged
+
+
+def format_sse(event, boot_id):
+    data = json.dumps(event, separators=(',', ':'))
+    return f"id: {boot_id}-{event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def stream(bus, since=None, run=None):
+    """Yield SSE text for events after seq since (default: from now)"""
+    seq = bus.last_seq()
+    # A seq past the end can only come from before a restart
+    if since is not None and since <= seq:
+        seq = since
+    # Servers only send the headers with the first body chunk, so start with
+    # one at once; it also sets the client's reconnect delay
+    yield f'retry: {RECONNECT_MS}\n\n'
+    last_sent = time.monotonic()
+
+    while True:
+        events, dropped = bus.read_since(seq, HEARTBEAT_INTERVAL)
+
+        if not events:
+            if time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+                last_sent = time.monotonic()
+                yield ': keepalive\n\n'
+            continue
+
+        first_seq = events[0]['seq']
+        seq = events[-1]['seq']
+        if run is not None:
+            events = [event for event in events if event.get('run') == run]
+
+        out = []
+        if dropped:
+            out.append(format_sse({'type': 'dropped', 'count': dropped, 'seq': first_seq - 1}, bus.boot_id))
+        out.extend(format_sse(event, bus.boot_id) for event in coalesce(events))
+        if out:
+            last_sent = time.monotonic()
+            yield ''.join(out)
+        elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+            last_sent = time.monotonic()
+            yield ': keepalive\n\n'
+
+        # Throttle: let events pile up so busy runs arrive in a few chunks
+        time.sleep(FLUSH_INTERVAL)
@@ -0,0 +1,285 @@
+"""
+Folder index for NR-prefixed images (001_, 002_, etc.)
+Built with a single os.scandir pass and cached per folder until the
+directory's mtime changes. Several roots, optionally searched recursively,
+are merged into one index with a deterministic priority order. Every file
+sharing an NR is kept as a variant (with size and mtime when there is more
+than one), so a policy can pick between retries without rescanning.
+"""
+
+import collections
+import concurrent.futures
+import os
+import re
+import threading
+
+import preflight
+
+# Extension order decides which file wins when one NR has several formats
+IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg', 'webp', 'tiff', 'bmp']
+
+# "014_anything.png" -> "014"
+NR_PREFIX_RE = re.compile(r'^(\d+)_')
+
+# How to choose between several files with one NR; 'first' is root, folder,
+# extension and name order
+VARIANT_POLICIES = ('first', 'newest', 'largest')
+
+# Folders kept warm (each subfolder of a recursive search counts), oldest dropped first
+MAX_CACHED_FOLDERS = 1024
+
+# Merged multi-root indexes kept warm
+MAX_CACHED_MERGED = 8
+
+# Deepest subfolder level a recursive search descends to
+MAX_DEPTH = 8
+
+# Roots are walked in parallel, at most this many at once
+MAX_PARALLEL_ROOTS = 8
+
+Variant = collections.namedtuple('Variant', 'name path size mtime_ns')
+
+_cache = {}
+_merged_cache = {}
+_cache_lock = threading.Lock()
+
+
+def format_nr(nr):
+    """Format NR as the filename prefix used by the generator (1 -> '001')"""
+    return str(nr).strip().zfill(3)
+
+
+def _extension_rank(filename):
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    try:
+        return IMAGE_EXTENSIONS.index(ext)
+    except ValueError:
+        return None
+
+
+def _cache_key(folder_path):
+    return os.path.normcase(os.path.abspath(folder_path))
+
+
+def _scan(folder_path):
+    """One scandir pass: (NR index, sorted subfolder paths)"""
+    index = {}
+    subfolders = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            # Directories first: chapter folders are often numbered too (01_intro)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.'):
+                        subfolders.append(entry.path)
+                    continue
+            except OSError:
+                continue
+            match = NR_PREFIX_RE.match(entry.name)
+            if not match:
+                continue
+            rank = _extension_rank(entry.name)
+            if rank is None:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            index.setdefault(match.group(1), []).append((rank, entry.name, entry))
+
+    # Same priority as the old per-extension glob: png first, then jpg, ...
+    for prefix, candidates in index.items():
+        candidates.sort()
+        if len(candidates) == 1:
+            # Nothing to choose between; skip the stat (not free outside Windows)
+            entry = candidates[0][2]
+            index[prefix] = [Variant(entry.name, entry.path, None, None)]
+        else:
+            index[prefix] = [_variant(entry) for _, _, entry in candidates]
+
+    subfolders.sort(key=lambda path: os.path.basename(path).casefold())
+    return index, subfolders
+
+
+def _variant(entry):
+    try:
+        st = entry.stat()
+    except OSError:
+        return Variant(entry.name, entry.path, None, None)
+    return Variant(entry.name, entry.path, st.st_size, st.st_mtime_ns)
+
+
+def _stat_variant(variant):
+    try:
+        st = os.stat(variant.path)
+    except OSError:
+        return variant
+    return variant._replace(size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+def build_index(folder_path):
+    """Scan folder once and group image files by NR prefix"""
+    return _scan(folder_path)[0]
+
+
+def _get_entry(folder_path):
+    """Cached (mtime, index, subfolders) for one folder, rescanned if it changed"""
+    key = _cache_key(folder_path)
+    mtime = os.stat(folder_path).st_mtime_ns
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached
+
+    entry = (mtime,) + _scan(folder_path)
+
+    with _cache_lock:
+        _cache.pop(key, None)
+        _cache[key] = entry
+        while len(_cache) > MAX_CACHED_FOLDERS:
+            _cache.pop(next(iter(_cache)))
+
+    return entry
+
+
+def get_index(folder_path):
+    """Return cached index for folder, rebuilding it if the folder changed"""
+    return _get_entry(folder_path)[1]
+
+
+def _walk(root, depth):
+    """[(folder, mtime, index)] for root and its subfolders, breadth-first to depth"""
+    folders = []
+    level = [root]
+    for _ in range(depth + 1):
+        next_level = []
+        for folder in level:
+            try:
+                mtime, index, subfolders = _get_entry(folder)
+            except OSError:
+                # Removed while we were walking
+                continue
+            folders.append((folder, mtime, index))
+            next_level.extend(subfolders)
+        if not next_level:
+            break
+        level = next_level
+    return folders
+
+
+def get_merged_index(roots, depth=0):
+    """One index over several roots, each searched depth subfolder levels deep
+
+    Candidates for an NR are ordered by root (earlier roots win), then
+    folder depth, then subfolder name, then extension priority, so the
+    same tree always resolves the same way. Only changed folders are
+    rescanned; an unchanged tree returns the cached merge.
+    """
+    depth = min(max(int(depth or 0), 0), MAX_DEPTH)
+    if len(roots) == 1 and depth == 0:
+        return get_index(roots[0])
+
+    if len(roots) == 1:
+        walks = [_walk(roots[0], depth)]
+    else:
+        workers = min(len(roots), MAX_PARALLEL_ROOTS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            walks = list(pool.map(lambda root: _walk(root, depth), roots))
+
+    key = (tuple(_cache_key(root) for root in roots), depth)
+    signature = tuple((folder, mtime) for walk in walks for folder, mtime, _ in walk)
+    with _cache_lock:
+        cached = _merged_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    merged = {}
+    seen = set()
+    for walk in walks:
+        for _, _, index in walk:
+            for prefix, candidates in index.items():
+                for variant in candidates:
+                    # Overlapping roots (a root inside another) list files twice
+                    path_key = os.path.normcase(variant.path)
+                    if path_key not in seen:
+                        seen.add(path_key)
+                        merged.setdefault(prefix, []).append(variant)
+
+    # Single files in their own folder weren't stat'ed; stat the ones that now compete
+    for variants in merged.values():
+        if len(variants) > 1:
+            variants[:] = [_stat_variant(v) if v.mtime_ns is None else v for v in variants]
+
+    with _cache_lock:
+        _merged_cache.pop(key, None)
+        _merged_cache[key] = (signature, merged)
+        while len(_merged_cache) > MAX_CACHED_MERGED:
+            _merged_cache.pop(next(iter(_merged_cache)))
+
+    return merged
+
+
+def lookup(index, nr):
+    """Return (filename, fullPath) for NR, or None if missing"""
+    candidates = index.get(format_nr(nr))
+    if not candidates:
+        return None
+    return candidates[0][:2]
+
+
+def resolve(index, nr, policy='first', pick=None):
+    """Choose one variant for NR; returns (chosen Variant or None, all variants)
+
+    pick names a variant by filename or full path and beats the policy; a
+    pick that matches nothing falls back to the policy. 'largest' compares
+    pixel counts from image headers (cached while files are unchanged),
+    then file size.
+    """
+    variants = index.get(format_nr(nr)) or []
+    if len(variants) <= 1:
+        return (variants[0] if variants else None), variants
+
+    if pick:
+        for variant in variants:
+            if pick in (variant.name, variant.path):
+                return variant, variants
+
+    # max() keeps the earliest variant on ties, so 'first' order breaks them
+    if policy == 'newest':
+        return max(variants, key=lambda v: v.mtime_ns or 0), variants
+    if policy == 'largest':
+        probes = preflight.preflight([v.path for v in variants])
+        return max(variants, key=lambda v: (_pixels(probes[v.path]), v.size or 0)), variants
+    return variants[0], variants
+
+
+def _pixels(probe):
+    return (probe.get('width') or 0) * (probe.get('height') or 0)
+
+
+def describe(variants):
+    """JSON-ready details for variants, dimensions read from image headers"""
+    probes = preflight.preflight([v.path for v in variants])
+    return [
+        {
+            'filename': v.name,
+            'fullPath': v.path,
+            'size': v.size,
+            'modified': round(v.mtime_ns / 1e9, 3) if v.mtime_ns else None,
+            'width': probes[v.path].get('width'),
+            'height': probes[v.path].get('height')
+        }
+        for v in variants
+    ]
+
+
+def invalidate(folder_path=None):
+    """Drop cached index for one folder, or all folders"""
+    with _cache_lock:
+        _merged_cache.clear()
+        if folder_path is None:
+            _cache.clear()
+        else:
+            _cache.pop(_cache_key(folder_path), None)
@@ -0,0 +1,84 @@
+"""
+Native folder picker in a helper process
+/browse-folder runs this file as a child process so Tk gets a main thread
+of its own and the bridge never blocks on a dialog. Request and response
+are one JSON line each on stdin/stdout.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+# Seconds a dialog may stay open before the helper is killed
+DEFAULT_TIMEOUT = 300
+
+# Don't flash a console window on Windows
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+_open_lock = threading.Lock()
+
+
+class PickerBusy(Exception):
+    """A folder picker dialog is already open"""
+
+
+class PickerTimeout(Exception):
+    """Nobody picked a folder before the timeout"""
+
+
+def pick(title='Select Image Folder', initial_dir=None, timeout=DEFAULT_TIMEOUT):
+    """Show the dialog in a helper process; returns the chosen path or None if cancelled"""
+    if not _open_lock.acquire(blocking=False):
+        raise PickerBusy('Folder picker is already open')
+    try:
+        helper = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            creationflags=CREATE_NO_WINDOW
+        )
+        request = json.dumps({'title': title, 'initialDir': initial_dir})
+        try:
+            out, err = helper.communicate(request + '\n', timeout=timeout)
+        except subprocess.TimeoutExpired:
+            helper.kill()
+            helper.communicate()
+            raise PickerTimeout(f'No folder selected within {timeout:g} seconds')
+    finally:
+        _open_lock.release()
+
+    try:
+        response = json.loads(out.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        raise RuntimeError(f'Folder picker failed: {err.strip() or "no response"}')
+    if response.get('error'):
+        raise RuntimeError(response['error'])
+    return response.get('path')
+
+
+def _show_dialog():
+    request = json.loads(sys.stdin.readline() or '{}')
+    try:
+        import tkinter
+        from tkinter import filedialog
+
+        root = tkinter.Tk()
+        root.withdraw()
+        root.attributes('-topmost', True)
+        path = filedialog.askdirectory(
+            title=request.get('title') or 'Select Image Folder',
+            initialdir=request.get('initialDir') or os.path.expanduser('~\\Pictures')
+        )
+        root.destroy()
+    except Exception as e:
+        print(json.dumps({'error': f'Folder picker not available: {e}'}))
+        return
+    print(json.dumps({'path': path or None}))
+
+
+if __name__ == '__main__':
+    _show_dialog()
@@ -0,0 +1,148 @@
+"""
+Background jobs for long placement runs
+A single worker thread runs jobs one at a time (Resolve calls must not
+overlap) while clients poll GET /jobs/<id> for progress
+"""
+
+import queue
+import threading
+import time
+import uuid
+
+# Finished jobs kept around for late polling, oldest dropped first
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """State and progress of one job; also the progress sink for its body"""
+
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.status = 'queued'
+        self.phase = 'queued'
+        self.counts = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._phase_started = {}
+        self._open_ended = False
+        self._lock = threading.Lock()
+
+    def set_phase(self, phase, total=None, open_ended=False):
+        """Enter phase; open_ended phases (streamed manifests) add to their total"""
+        with self._lock:
+            counts = self.counts.get(phase)
+            if not (open_ended and counts):
+                self._phase_started[phase] = time.monotonic()
+            self.phase = phase
+            self._open_ended = open_ended
+            if total is None:
+                return
+            if open_ended and counts:
+                counts['total'] += total
+            else:
+                self.counts[phase] = {'done': 0, 'total': total}
+
+    def advance(self, count=1):
+        with self._lock:
+            counts = self.counts.get(self.phase)
+            if counts is not None:
+                counts['done'] = min(counts['done'] + count, counts['total'])
+
+    def to_dict(self):
+        with self._lock:
+            data = {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'phase': self.phase,
+                'counts': {phase: dict(c) for phase, c in self.counts.items()},
+                'throughput': None,
+                'eta': None,
+                'createdAt': self.created_at,
+                'startedAt': self.started_at,
+                'finishedAt': self.finished_at
+            }
+
+            # Clips/sec within the current phase, and seconds left in it
+            counts = self.counts.get(self.phase)
+            if counts and self.phase in self._phase_started:
+                elapsed = time.monotonic() - self._phase_started[self.phase]
+                if counts['done'] and elapsed > 0:
+                    rate = counts['done'] / elapsed
+                    data['throughput'] = round(rate, 2)
+                    if not self._open_ended:
+                        data['eta'] = round((counts['total'] - counts['done']) / rate, 1)
+
+            if self.status == 'done':
+                data['result'] = self.result
+            elif self.status == 'failed':
+                data['error'] = self.error
+            return data
+
+
+class JobRunner:
+    """Runs submitted jobs one after another on a worker thread"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name='job-worker', daemon=True)
+            self._thread.start()
+
+    def submit(self, kind, body):
+        """Queue body(job) and return the Job immediately"""
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._ensure_worker()
+        self._queue.put((job, body))
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status in ('queued', 'running'))
+
+    def status_counts(self):
+        """Number of known jobs per status"""
+        counts = dict.fromkeys(('queued', 'running', 'done', 'failed'), 0)
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def _work(self):
+        while True:
+            job, body = self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                job.result = body(job)
+                if isinstance(job.result, dict) and job.result.get('success') is False:
+                    job.error = job.result.get('message')
+                    job.status = 'failed'
+                else:
+                    job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+            job.finished_at = time.time()
+            self._prune()
+
+    def _prune(self):
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.status in ('done', 'failed')]
+            for job in finished[:-MAX_FINISHED_JOBS]:
+                del self._jobs[job.id]
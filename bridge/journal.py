@@ -0,0 +1,183 @@
+"""
+Append-only placement journal for crash-safe resume
+Every run writes which files it imported and which clips it placed to
+<run id>.jsonl, one fsync per batch. If Resolve or the bridge dies mid-run,
+a run started with settings.resume=<run id> skips everything the journal
+says is done. A torn last line (crash during a write) is ignored.
+"""
+
+import collections
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+JOURNAL_DIR = os.path.join(
+    os.getenv('LOCALAPPDATA', tempfile.gettempdir()),
+    'DaVinciBridge',
+    'journals'
+)
+
+# Journals kept on disk, oldest deleted first
+MAX_JOURNALS = 50
+
+# Run IDs are uuid4 hex prefixes, -<n> for each timeline of a multi-timeline
+# run; anything else could escape JOURNAL_DIR
+RUN_ID_RE = re.compile(r'^[0-9a-f]{1,32}(-[0-9]{1,4})?$')
+
+_prune_lock = threading.Lock()
+
+
+class JournalError(Exception):
+    """A journal can't be found or doesn't match the run resuming it"""
+
+
+def journal_path(run_id, journal_dir=JOURNAL_DIR):
+    if not RUN_ID_RE.match(run_id or ''):
+        raise JournalError(f'Invalid run ID: {run_id}')
+    return os.path.join(journal_dir, f'{run_id}.jsonl')
+
+
+def exists(run_id, journal_dir=JOURNAL_DIR):
+    return os.path.exists(journal_path(run_id, journal_dir))
+
+
+def run_exists(run_id, journal_dir=JOURNAL_DIR):
+    """Whether a run (or the first timeline of a multi-timeline run) has a journal"""
+    try:
+        return exists(run_id, journal_dir) or exists(f'{run_id}-0', journal_dir)
+    except JournalError:
+        return False
+
+
+class JournalState:
+    """What an earlier run (or runs, for a resumed one) got done"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.timeline = None
+        self.track = None
+        self.started_at = None
+        self.finished = False
+        self.imported = set()
+        # (path key, recordFrame, duration) -> how many such clips were placed
+        self.placed = collections.Counter()
+        # Batch sent to AppendToTimeline whose outcome was never recorded
+        self.pending = []
+
+    def apply(self, record):
+        kind = record.get('type')
+        if kind == 'start':
+            if self.started_at is None:
+                self.timeline = record.get('timeline')
+                self.track = record.get('track')
+                self.started_at = record.get('at')
+            self.finished = False
+        elif kind == 'imported':
+            self.imported.update(record['keys'])
+        elif kind == 'placing':
+            self.pending = [tuple(clip) for clip in record['clips']]
+        elif kind == 'placed':
+            self.pending = []
+            for nr, key, start, duration in record['clips']:
+                self.placed[(key, start, duration)] += 1
+        elif kind == 'done':
+            self.finished = True
+
+    def to_dict(self):
+        return {
+            'runId': self.run_id,
+            'timeline': self.timeline,
+            'track': self.track,
+            'startedAt': self.started_at,
+            'finished': self.finished,
+            'imported': len(self.imported),
+            'placed': sum(self.placed.values())
+        }
+
+
+def load(run_id, journal_dir=JOURNAL_DIR):
+    """Replay a journal into a JournalState"""
+    path = journal_path(run_id, journal_dir)
+    if not os.path.exists(path):
+        raise JournalError(f'No journal for run {run_id}')
+
+    state = JournalState(run_id)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn write from a crash; nothing after it was acknowledged
+                break
+            state.apply(record)
+    return state
+
+
+def list_journals(journal_dir=JOURNAL_DIR):
+    """Summaries of the journals on disk, newest first"""
+    try:
+        names = [name for name in os.listdir(journal_dir) if name.endswith('.jsonl')]
+    except OSError:
+        return []
+    states = []
+    for name in names:
+        try:
+            states.append(load(name[:-len('.jsonl')], journal_dir))
+        except (JournalError, OSError):
+            continue
+    states.sort(key=lambda state: state.started_at or 0, reverse=True)
+    return [state.to_dict() for state in states]
+
+
+class Journal:
+    """Writer for one run's journal; every write is flushed and fsync'ed"""
+
+    def __init__(self, run_id, journal_dir=JOURNAL_DIR):
+        self.run_id = run_id
+        self.path = journal_path(run_id, journal_dir)
+        os.makedirs(journal_dir, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        prune(journal_dir, keep=self.path)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def start(self, timeline, track, resumed=False):
+        self._write({'type': 'start', 'at': time.time(), 'timeline': timeline, 'track': track, 'resumed': resumed})
+
+    def imported(self, keys):
+        if keys:
+            self._write({'type': 'imported', 'keys': list(keys)})
+
+    def placing(self, clips):
+        """Record a batch before AppendToTimeline; clips are (nr, key, start, duration)"""
+        self._write({'type': 'placing', 'clips': clips})
+
+    def placed(self, clips):
+        self._write({'type': 'placed', 'clips': clips})
+
+    def done(self, success):
+        self._write({'type': 'done', 'at': time.time(), 'success': success})
+
+    def close(self):
+        self._file.close()
+
+
+def prune(journal_dir=JOURNAL_DIR, keep=None, max_journals=MAX_JOURNALS):
+    """Delete the oldest journals beyond max_journals"""
+    with _prune_lock:
+        entries = []
+        with os.scandir(journal_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith('.jsonl') and entry.path != keep:
+                    entries.append((entry.stat().st_mtime, entry.path))
+        for _, path in sorted(entries)[:max(0, len(entries) - max_journals + 1)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,48 @@
+"""
+Deferred imports for slow or optional modules
+fusionscript, tkinter, NumPy and Pillow together take longer to load than
+the rest of the bridge, so they are imported on first use (or by the
+warm-up thread) instead of before the server can answer
+"""
+
+import importlib
+import threading
+import time
+
+
+class LazyModule:
+    """A module imported once, on first get(); None if it isn't installed
+
+    loader is a module name or a function returning the module (and raising
+    ImportError when it is unavailable).
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._module = None
+        self.loaded = False
+        self.error = None
+        self.load_ms = None
+
+    def get(self):
+        if self.loaded:
+            return self._module
+        with self._lock:
+            if not self.loaded:
+                start = time.perf_counter()
+                try:
+                    if callable(self._loader):
+                        self._module = self._loader()
+                    else:
+                        self._module = importlib.import_module(self._loader)
+                except ImportError as e:
+                    self.error = str(e)
+                self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+                self.loaded = True
+        return self._module
+
+    @property
+    def available(self):
+        """Whether the module can be used (imports it if that hasn't happened yet)"""
+        return self.get() is not None
@@ -0,0 +1,107 @@
+"""
+Streaming manifest parsing for /place-manifest
+Reads CSV exports (NR, Image Prompt, Related Script Text, Timestamp, ...)
+or NDJSON one row at a time and keeps only what placement needs, so long
+prompt text is dropped as soon as its row has been parsed
+"""
+
+import csv
+import io
+import json
+
+import folder_index
+
+# Header names accepted for each field (compared case-insensitively)
+NR_COLUMNS = ('nr', 'number', '#')
+TIMESTAMP_COLUMNS = ('timestamp', 'time', 'timecode')
+START_COLUMNS = ('start', 'start time')
+END_COLUMNS = ('end', 'end time')
+
+
+def _find_column(header, names):
+    for i, name in enumerate(header):
+        if name.strip().lower() in names:
+            return i
+    return None
+
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """Yield {'nr', 'timestamp'} for each CSV row of a binary stream
+
+    The header is read right away: a CSV without an NR column, or without
+    a timestamp column or start and end columns, raises ValueError here
+    instead of importing every image and placing none.
+    """
+    reader = csv.reader(io.TextIOWrapper(stream, encoding=encoding, newline=''))
+    header = next(reader, None)
+    if not header:
+        return iter(())
+
+    nr_col = _find_column(header, NR_COLUMNS)
+    if nr_col is None:
+        raise ValueError('CSV has no NR column')
+    timestamp_col = _find_column(header, TIMESTAMP_COLUMNS)
+    start_col = _find_column(header, START_COLUMNS)
+    end_col = _find_column(header, END_COLUMNS)
+    if timestamp_col is None and (start_col is None or end_col is None):
+        raise ValueError('CSV has no Timestamp column (or Start and End columns); '
+                         'add one to exported script-prompts/keywords CSVs')
+
+    return _csv_rows(reader, nr_col, timestamp_col, start_col, end_col)
+
+
+def _csv_rows(reader, nr_col, timestamp_col, start_col, end_col):
+    for row in reader:
+        if len(row) <= nr_col or not row[nr_col].strip():
+            continue
+        if timestamp_col is not None and timestamp_col < len(row):
+            timestamp = row[timestamp_col].strip()
+        elif start_col is not None and end_col is not None and end_col < len(row) and start_col < len(row):
+            timestamp = f"{row[start_col].strip()}-{row[end_col].strip()}"
+        else:
+            timestamp = ''
+        yield {'nr': _parse_nr(row[nr_col]), 'timestamp': timestamp}
+
+
+def iter_ndjson_rows(stream, encoding='utf-8'):
+    """Yield mappings from newline-delimited JSON; blank lines are skipped"""
+    for line_number, line in enumerate(io.TextIOWrapper(stream, encoding=encoding), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f'Line {line_number}: {e}')
+        mapping = {
+            'nr': _parse_nr(row.get('nr', row.get('NR'))),
+            'timestamp': row.get('timestamp', '')
+        }
+        if row.get('fullPath'):
+            mapping['fullPath'] = row['fullPath']
+            mapping['filename'] = row.get('filename')
+            mapping['found'] = row.get('found', True)
+        yield mapping
+
+
+def _parse_nr(value):
+    text = str(value).strip()
+    return int(text) if text.isdigit() else text
+
+
+def resolve_rows(rows, roots, missing, depth=0, policy='first'):
+    """Attach image files from the roots' merged index; NRs with no file go to missing"""
+    index = folder_index.get_merged_index(roots, depth) if roots else {}
+    for mapping in rows:
+        if 'fullPath' not in mapping:
+            match, _ = folder_index.resolve(index, mapping['nr'], policy)
+            if match:
+                mapping['filename'], mapping['fullPath'] = match.name, match.path
+                mapping['found'] = True
+            else:
+                mapping['filename'] = None
+                mapping['fullPath'] = None
+                mapping['found'] = False
+        if not mapping.get('found'):
+            missing.append(mapping['nr'])
+        yield mapping
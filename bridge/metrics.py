@@ -0,0 +1,230 @@
+"""
+Prometheus metrics for /metrics
+Minimal in-process counters, gauges and histograms rendered in the
+Prometheus text format, plus a transparent proxy that times every
+DaVinci Resolve API call. Recording is a lock and a bisect, cheap enough
+to leave on.
+"""
+
+import bisect
+import threading
+import time
+
+# Seconds; covers cached HTTP hits (sub-ms) up to whole placements
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Resolve calls range from sub-ms getters to multi-second ImportMedia batches
+RESOLVE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}')
+        return lines
+
+
+class Gauge:
+    """Gauge set directly, or read from a callback (returning {label_values: value}) at scrape time"""
+
+    def __init__(self, name, help_text, labels=(), callback=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.callback = callback
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        if self.callback:
+            items = sorted(self.callback().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=HTTP_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label_values -> [per-bucket counts (+Inf last), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for label_values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, [('le', _format_value(float(bound)))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {total!r}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    'bridge_http_requests_total', 'HTTP requests handled', ('endpoint', 'method', 'status')))
+http_duration = registry.register(Histogram(
+    'bridge_http_request_duration_seconds', 'Time to produce an HTTP response', ('endpoint', 'method')))
+http_in_flight = registry.register(Gauge(
+    'bridge_http_requests_in_flight', 'HTTP requests being handled'))
+
+resolve_duration = registry.register(Histogram(
+    'bridge_resolve_call_duration_seconds', 'DaVinci Resolve API call latency', ('method',), RESOLVE_BUCKETS))
+resolve_errors = registry.register(Counter(
+    'bridge_resolve_call_errors_total', 'DaVinci Resolve API calls that raised', ('method',)))
+
+clips = registry.register(Counter(
+    'bridge_clips_total', 'Clips handled by placement runs', ('outcome',)))
+runs = registry.register(Counter(
+    'bridge_placement_runs_total', 'Placement runs', ('result',)))
+
+
+def record_run(result):
+    """Count one placement run's outcome (a run_placement() response)"""
+    runs.inc('success' if result.get('success') else 'failed')
+    for outcome, value in (
+        ('imported', result.get('imported', 0) - result.get('reused', 0)),
+        ('reused', result.get('reused', 0)),
+        ('placed', result.get('placed', 0)),
+        ('import_error', len(result.get('importErrors', []))),
+        ('placement_error', len(result.get('placementErrors', []))),
+    ):
+        if value > 0:
+            clips.inc(outcome, amount=value)
+
+
+def _unwrap(value):
+    if isinstance(value, TimedProxy):
+        return value._target
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+def _wrap(value):
+    if value is None or isinstance(value, (str, bytes, int, float, bool, dict, TimedProxy)):
+        return value
+    if isinstance(value, list):
+        return [_wrap(v) for v in value]
+    return TimedProxy(value)
+
+
+class TimedProxy:
+    """Wraps a Resolve API object; every method call is timed into resolve_duration
+
+    Objects the call returns are wrapped too, and proxies passed back in as
+    arguments are unwrapped, so Resolve only ever sees its own objects.
+    """
+
+    __slots__ = ('_target', '__dict__')
+
+    def __init__(self, target):
+        object.__setattr__(self, '_target', target)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _wrap(attr(*_unwrap(list(args)), **_unwrap(kwargs)))
+            except Exception:
+                resolve_errors.inc(name)
+                raise
+            finally:
+                resolve_duration.observe(time.perf_counter() - start, name)
+
+        # Cached on the instance, so later lookups skip __getattr__
+        self.__dict__[name] = timed
+        return timed
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __bool__(self):
+        return bool(self._target)
+
+
+def instrument(resolve):
+    """Wrap a scriptapp('Resolve') handle (None passes through)"""
+    return _wrap(resolve)
@@ -0,0 +1,811 @@
+"""
+Image placement run: import a manifest into the media pool and place it
+on the current timeline (or on several named timelines, sharing imports).
+Used by /place-images and by placement jobs. Progress is journaled so a
+crashed run can be resumed.
+"""
+
+import os
+import time
+
+import conform
+import content_hash
+import journal
+import preflight
+import resolve_batch
+import resolve_executor
+import timecode
+import timeline_sync
+
+# Media pool bin every run imports into
+IMPORT_BIN_NAME = "Imported_Images"
+
+
+class PreflightFailed(Exception):
+    """Strict preflight found files Resolve would reject"""
+
+    def __init__(self, failures):
+        super().__init__(f'{len(failures)} image(s) failed preflight')
+        self.failures = failures
+
+
+class NullProgress:
+    """Progress sink for synchronous runs that nobody is watching"""
+
+    def set_phase(self, phase, total=None, open_ended=False):
+        pass
+
+    def advance(self, count=1):
+        pass
+
+
+def _no_events(event_type, **fields):
+    pass
+
+
+def read_timing(timeline, settings):
+    """(fps, drop_frame, start frame) of a run; ValueError if the settings are invalid"""
+    fps = timecode.parse_fps(settings.get('fps') or timeline.GetSetting('timelineFrameRate'))
+    if 'dropFrame' in settings:
+        drop_frame = bool(settings.get('dropFrame'))
+    else:
+        drop_frame = timeline.GetSetting('timelineDropFrameTimecode') == '1'
+    if drop_frame:
+        timecode.check_drop_frame(fps)
+    if settings.get('startTimecode'):
+        start_offset = timecode.to_frame(str(settings['startTimecode']), fps, drop_frame)
+    else:
+        start_offset = timeline.GetStartFrame() or 0
+    return fps, drop_frame, start_offset
+
+
+class PlacementRun:
+    """Shared state of one run: imported clips, clipInfos and the error lists"""
+
+    def __init__(self, media_pool, import_folder, timeline, settings, progress, emit,
+                 run_journal=None, resumed=None, shared=None, timing=None):
+        self.media_pool = media_pool
+        self.import_folder = import_folder
+        self.timeline = timeline
+        self.settings = settings
+        self.progress = progress
+        self.emit = emit
+
+        self.video_track = int(settings.get('videoTrack', 2))
+        self.sync = settings.get('mode') == 'sync'
+        self.reuse = settings.get('reuseExisting', True)
+
+        # Exact timeline rate (23.976 stays 24000/1001) and start timecode offset
+        self.fps, self.drop_frame, self.start_offset = timing or read_timing(timeline, settings)
+
+        # Journal of this run, and what the run being resumed already did
+        self.journal = run_journal
+        self.resumed = resumed
+        self.resumed_stats = {'imports': 0, 'placements': 0}
+
+        # Clips already in the bin from an earlier run are reused, not re-imported
+        self.existing = shared.existing if shared else {}
+        if not self.existing and (self.reuse or self.sync or resumed):
+            self.existing = resolve_batch.index_folder_clips(import_folder)
+
+        self.total = 0
+        # shared is the run of an earlier timeline in the same request; its
+        # imports (and conformed copies, content index) are used as-is
+        self.items_by_path = shared.items_by_path if shared else {}
+        # Keys an earlier timeline imported; used again here, they count as reused
+        self.inherited = frozenset(self.items_by_path)
+        self.imported_items = {}
+        self.imported_keys = set()
+        self.reused_keys = set()
+        self.shared_keys = set()
+        self.import_errors = []
+        self.placement_errors = []
+        self.placed_count = 0
+        self.clip_infos = []
+        self.clip_nrs = []
+        self.clip_keys = []
+        self.sync_stats = None
+
+        # 'skip' leaves bad files out, 'strict' stops the run, 'off' only checks existence
+        self.preflight_mode = settings.get('preflight', 'skip')
+        self.preflight_stats = {'checked': 0, 'failed': 0, 'ms': 0.0}
+        self.preflight_warnings = []
+
+        # Optional conform stage: 'fit' downscales/converts, 'letterbox' also pads
+        # to the timeline aspect; Resolve then imports the conformed copies
+        self.conform = settings.get('conform') or None
+        if self.conform is True:
+            self.conform = 'fit'
+        self.conform_stats = None
+        if self.conform:
+            self.conform_stats = {'conformed': 0, 'ms': 0.0}
+            if not conform.pil_image.available:
+                self.conform_stats['skipped'] = 'Pillow is not installed'
+                self.conform = None
+            else:
+                self.conform_size = (
+                    int(timeline.GetSetting('timelineResolutionWidth') or 1920),
+                    int(timeline.GetSetting('timelineResolutionHeight') or 1080)
+                )
+        self.import_paths = shared.import_paths if shared else {}
+        # Path keys of every clip in the images bin, read once if conforming needs them
+        self.bin_keys = shared.bin_keys if shared else None
+
+        # Identical files under different names are imported once; their keys
+        # map to the key of the file that actually was imported
+        self.contents = None
+        self.aliases = {}
+        if shared:
+            self.contents = shared.contents
+            self.aliases = shared.aliases
+        elif settings.get('dedupeContent', True):
+            self.contents = content_hash.ContentIndex()
+            if self.reuse:
+                for key in self.existing:
+                    self.contents.add(key)
+
+    def source_path(self, mapping):
+        """Path Resolve actually imports for a mapping (its conformed copy, if any)"""
+        path = mapping.get('fullPath')
+        return self.import_paths.get(path, path)
+
+    def import_chunk(self, mappings, open_ended=False):
+        """Import the files of these mappings that aren't in the media pool yet"""
+        emit = self.emit
+        to_import = []
+        candidates = [mapping for mapping in mappings if mapping.get('found')]
+
+        # Header-only checks in parallel, so Resolve never sees a bad file
+        if self.preflight_mode != 'off' or self.conform:
+            self.progress.set_phase('preflight')
+            preflight_start = time.perf_counter()
+            probes = preflight.preflight([m.get('fullPath') for m in candidates if m.get('fullPath')])
+            self.preflight_stats['checked'] += len(probes)
+            self.preflight_stats['ms'] += round((time.perf_counter() - preflight_start) * 1000, 1)
+        else:
+            probes = {}
+
+        failures = []
+        for mapping in candidates:
+            filepath = mapping.get('fullPath')
+            nr = mapping.get('nr')
+
+            if not filepath or not os.path.exists(filepath):
+                failures.append((nr, 'File not found'))
+                continue
+
+            probe = probes.get(filepath)
+            if probe is not None:
+                if not probe['ok']:
+                    failures.append((nr, probe['error']))
+                    continue
+                for warning in probe['warnings']:
+                    self.preflight_warnings.append(f"#{nr}: {warning}")
+
+            to_import.append(mapping)
+
+        for nr, message in failures:
+            self.import_errors.append(f"#{nr}: {message}")
+            emit('failed', nr=nr, stage='import', message=message)
+        self.preflight_stats['failed'] += len(failures)
+        if failures and self.preflight_mode == 'strict':
+            raise PreflightFailed(failures)
+
+        if self.conform:
+            to_import = self.conform_chunk(to_import, probes)
+
+        # Unique paths, so NRs sharing a file are imported once
+        nrs_by_path = {}
+        for mapping in to_import:
+            path = self.source_path(mapping)
+            key = resolve_batch.path_key(path)
+            if key in self.items_by_path:
+                # Imported by an earlier chunk of this run, or an earlier timeline
+                if key in self.inherited:
+                    self.shared_keys.add(key)
+                    emit('imported', nr=mapping.get('nr'), reused=True)
+                else:
+                    emit('imported', nr=mapping.get('nr'))
+                continue
+            nrs_by_path.setdefault(key, (path, []))[1].append(mapping.get('nr'))
+
+        if self.reuse or self.resumed:
+            reused = []
+            for key, (_, nrs) in nrs_by_path.items():
+                if key not in self.existing:
+                    continue
+                journaled = self.resumed is not None and key in self.resumed.imported
+                if not (self.reuse or journaled):
+                    continue
+                self.items_by_path[key] = self.existing[key]
+                self.reused_keys.add(key)
+                reused.append(key)
+                if journaled:
+                    self.resumed_stats['imports'] += 1
+                for nr in nrs:
+                    emit('imported', nr=nr, reused=True)
+            if self.journal:
+                self.journal.imported(reused)
+
+        # Same content as a clip already imported (or about to be): alias it
+        pending_aliases = []
+        import_paths = []
+        for key, (path, nrs) in nrs_by_path.items():
+            if key in self.items_by_path:
+                continue
+            canonical = resolve_batch.path_key(self.contents.add(path)) if self.contents else key
+            if canonical == key:
+                import_paths.append(path)
+                continue
+            self.aliases[key] = canonical
+            if canonical not in self.items_by_path and canonical in self.existing:
+                self.items_by_path[canonical] = self.existing[canonical]
+                self.reused_keys.add(canonical)
+            if canonical in self.items_by_path:
+                self.items_by_path[key] = self.items_by_path[canonical]
+                for nr in nrs:
+                    emit('imported', nr=nr, duplicate=True)
+            else:
+                pending_aliases.append(key)
+
+        self.progress.set_phase('import', len(import_paths), open_ended)
+        batch_size = resolve_batch.auto_batch_size(len(import_paths), self.settings.get('importBatchSize'))
+
+        for batch in resolve_batch.chunked(import_paths, batch_size):
+            batch_start = time.perf_counter()
+            batch_items, _ = resolve_batch.import_media_batched(self.media_pool, batch, len(batch))
+            self.items_by_path.update(batch_items)
+            if self.journal:
+                self.journal.imported(batch_items)
+            emit('batch', phase='import', size=len(batch), ms=round((time.perf_counter() - batch_start) * 1000, 1))
+
+            for path in batch:
+                key = resolve_batch.path_key(path)
+                for nr in nrs_by_path[key][1]:
+                    if key in batch_items:
+                        emit('imported', nr=nr)
+                    else:
+                        emit('failed', nr=nr, stage='import')
+            self.progress.advance(len(batch))
+
+        for key in pending_aliases:
+            item = self.items_by_path.get(self.aliases[key])
+            if item:
+                self.items_by_path[key] = item
+            for nr in nrs_by_path[key][1]:
+                if item:
+                    emit('imported', nr=nr, duplicate=True)
+                else:
+                    emit('failed', nr=nr, stage='import')
+
+        for mapping in to_import:
+            nr = mapping.get('nr')
+            key = resolve_batch.path_key(self.source_path(mapping))
+            item = self.items_by_path.get(key)
+            if item:
+                self.imported_items[nr] = item
+                self.imported_keys.add(key)
+            else:
+                self.import_errors.append(f"#{nr}: Failed to import {mapping.get('filename')}")
+
+    def conform_chunk(self, mappings, probes):
+        """Conform the chunk's stills on the process pool; returns the mappings still importable"""
+        self.progress.set_phase('conform')
+        conform_start = time.perf_counter()
+        width, height = self.conform_size
+
+        # Clips in the bin may be backed by cached copies; those must survive eviction
+        if self.bin_keys is None:
+            self.bin_keys = set(self.existing or resolve_batch.index_folder_clips(self.import_folder))
+        paths, errors = conform.conform_paths(
+            {m['fullPath']: probes.get(m['fullPath']) for m in mappings},
+            width,
+            height,
+            self.conform,
+            max_cache_mb=int(self.settings.get('conformCacheMB') or conform.DEFAULT_MAX_CACHE_MB),
+            in_use=self.bin_keys | set(self.items_by_path)
+        )
+        self.import_paths.update(paths)
+        self.conform_stats['conformed'] += sum(1 for path, target in paths.items() if path != target)
+        self.conform_stats['ms'] += round((time.perf_counter() - conform_start) * 1000, 1)
+
+        kept = []
+        for mapping in mappings:
+            message = errors.get(mapping['fullPath'])
+            if message:
+                nr = mapping.get('nr')
+                self.import_errors.append(f"#{nr}: {message}")
+                self.emit('failed', nr=nr, stage='import', message=message)
+            else:
+                kept.append(mapping)
+        return kept
+
+    def build_clips(self, mappings):
+        """Append clipInfos for the imported mappings; returns their indices"""
+        # Convert every range in one call so adjacent clips share exact boundaries
+        placeable = [mapping for mapping in mappings if mapping.get('nr') in self.imported_items]
+        starts, durations, range_errors = timecode.convert_ranges(
+            [mapping.get('timestamp', '') for mapping in placeable],
+            self.fps,
+            self.start_offset,
+            self.drop_frame
+        )
+
+        first = len(self.clip_infos)
+        for i, mapping in enumerate(placeable):
+            nr = mapping.get('nr')
+
+            if i in range_errors:
+                self.placement_errors.append(f"#{nr}: {range_errors[i]}")
+                self.emit('failed', nr=nr, stage='placement', message=range_errors[i])
+                continue
+
+            self.clip_infos.append({
+                "mediaPoolItem": self.imported_items[nr],
+                "startFrame": 0,
+                "endFrame": int(durations[i]),
+                "trackIndex": self.video_track,
+                "recordFrame": int(starts[i])
+            })
+            self.clip_nrs.append(nr)
+            key = resolve_batch.path_key(self.source_path(mapping))
+            self.clip_keys.append(self.aliases.get(key, key))
+        return list(range(first, len(self.clip_infos)))
+
+    def sync_track(self):
+        """Diff all clipInfos against the track; returns indices still to place"""
+        self.progress.set_phase('sync')
+        desired = [
+            (key, info['recordFrame'], info['endFrame'] - info['startFrame'])
+            for key, info in zip(self.clip_keys, self.clip_infos)
+        ]
+        managed_keys = set(self.existing) | set(self.clip_keys)
+        keep, append, replace, delete = timeline_sync.plan_sync(
+            timeline_sync.read_track(self.timeline, self.video_track),
+            desired,
+            managed_keys
+        )
+
+        if delete and not self.timeline.DeleteClips(delete, False):
+            self.placement_errors.append(
+                f"Failed to remove {len(delete)} outdated clips from track {self.video_track}"
+            )
+
+        for i in keep:
+            self.placed_count += 1
+            self.emit('placed', nr=self.clip_nrs[i], recordFrame=self.clip_infos[i]['recordFrame'], unchanged=True)
+
+        self.sync_stats = {
+            'unchanged': len(keep),
+            'appended': len(append),
+            'replaced': len(replace),
+            'deleted': len(delete)
+        }
+        return sorted(append + replace)
+
+    def journal_clip(self, i):
+        """(nr, path key, recordFrame, duration): how the journal identifies a placed clip"""
+        info = self.clip_infos[i]
+        return (self.clip_nrs[i], self.clip_keys[i], info['recordFrame'], info['endFrame'] - info['startFrame'])
+
+    def recover_pending(self):
+        """Settle the batch a crashed run sent to AppendToTimeline but never journaled
+
+        Clips of that batch found on the track count as placed, so a resume
+        neither duplicates nor drops them.
+        """
+        if not self.resumed.pending:
+            return
+        on_track = {
+            (key, start, duration)
+            for _, key, start, duration in timeline_sync.read_track(self.timeline, self.video_track)
+        }
+        found = [clip for clip in self.resumed.pending if tuple(clip[1:]) in on_track]
+        for _, key, start, duration in found:
+            self.resumed.placed[(key, start, duration)] += 1
+        if self.journal:
+            self.journal.placed(found)
+        self.resumed.pending = []
+
+    def skip_placed(self, to_place):
+        """Drop clips the resumed run already placed; returns the rest"""
+        remaining = []
+        for i in to_place:
+            nr, key, start, duration = self.journal_clip(i)
+            if self.resumed.placed[(key, start, duration)] > 0:
+                self.resumed.placed[(key, start, duration)] -= 1
+                self.resumed_stats['placements'] += 1
+                self.placed_count += 1
+                self.emit('placed', nr=nr, recordFrame=start, resumed=True)
+            else:
+                remaining.append(i)
+        return remaining
+
+    def place(self, to_place, open_ended=False):
+        """Append the given clipInfos to the timeline in batches"""
+        # Sync mode already diffs against the track, so only plain runs skip here
+        if self.resumed and not self.sync:
+            to_place = self.skip_placed(to_place)
+
+        self.progress.set_phase('placement', len(to_place), open_ended)
+        batch_size = int(self.settings.get('placementBatchSize') or resolve_batch.DEFAULT_PLACEMENT_BATCH_SIZE)
+
+        for start in range(0, len(to_place), batch_size):
+            indices = to_place[start:start + batch_size]
+            batch = [self.clip_infos[i] for i in indices]
+            if self.journal:
+                self.journal.placing([self.journal_clip(i) for i in indices])
+            batch_start = time.perf_counter()
+            timeline_items = resolve_batch.append_to_timeline_batched(self.media_pool, batch, len(batch))
+            self.emit('batch', phase='placement', size=len(batch), ms=round((time.perf_counter() - batch_start) * 1000, 1))
+
+            placed = []
+            for i, timeline_item in zip(indices, timeline_items):
+                nr = self.clip_nrs[i]
+                if timeline_item:
+                    self.placed_count += 1
+                    placed.append(self.journal_clip(i))
+                    self.emit('placed', nr=nr, recordFrame=self.clip_infos[i]['recordFrame'])
+                else:
+                    self.placement_errors.append(f"#{nr}: Failed to place on timeline")
+                    self.emit('failed', nr=nr, stage='placement')
+            if self.journal:
+                self.journal.placed(placed)
+            self.progress.advance(len(batch))
+
+    def result(self):
+        result = {
+            'success': True,
+            'imported': len(self.imported_items),
+            'reused': len(self.reused_keys | self.shared_keys),
+            'deduplicated': len(self.aliases),
+            'placed': self.placed_count,
+            'total': self.total,
+            'importErrors': self.import_errors,
+            'placementErrors': self.placement_errors
+        }
+        if self.sync_stats:
+            result['sync'] = self.sync_stats
+        if self.preflight_mode != 'off':
+            result['preflight'] = dict(self.preflight_stats, warnings=self.preflight_warnings)
+        if self.conform_stats:
+            result['conform'] = self.conform_stats
+        if self.journal:
+            result['runId'] = self.journal.run_id
+        if self.resumed:
+            result['resumed'] = self.resumed_stats
+        return result
+
+
+def run_placement(session, data, progress=None, emit=None, run_id=None):
+    """Import and place a manifest, returning the /place-images response
+
+    data['mappings'] is a list, or any iterable of mappings for streamed
+    manifests: those are imported and placed a chunk at a time as rows
+    arrive. progress gets phase changes and per-batch counts; emit(type,
+    **fields) gets per-clip imported/placed/failed events and batch timings.
+    The run is journaled under run_id (or settings['resume'], whose
+    journal it continues) unless settings['journal'] is false.
+    data['timelines'] instead places on several timelines, see run_timelines().
+
+    Resolve calls go through resolve_executor (inline when already on its
+    thread). A streamed manifest is read on the calling thread between
+    chunks, so call this off the executor when the rows come from an upload.
+    """
+    progress = progress or NullProgress()
+    emit = emit or _no_events
+
+    mappings = data.get('mappings', [])
+    settings = data.get('settings', {})
+
+    started = resolve_executor.run(_start, session, data, settings, progress, emit, run_id)
+    if isinstance(started, dict):
+        return started
+    return _finish_run(started, mappings, settings)
+
+
+def _start(session, data, settings, progress, emit, run_id):
+    """Connect and set up the run; returns a PlacementRun, or a finished response"""
+    # Reuse the persistent session, but revalidate project/timeline now
+    progress.set_phase('connect')
+    resolve, project, timeline = session.current(max_age=0)
+    if not resolve:
+        return {
+            'success': False,
+            'message': 'Cannot connect to DaVinci Resolve. Make sure it is running.'
+        }
+
+    if not project:
+        return {
+            'success': False,
+            'message': 'No project open in DaVinci Resolve'
+        }
+
+    if data.get('timelines'):
+        return run_timelines(project, data['timelines'], settings, progress, emit, run_id)
+
+    if not timeline:
+        return {
+            'success': False,
+            'message': 'No timeline selected in DaVinci Resolve'
+        }
+
+    media_pool, import_folder = _open_bin(project, progress)
+    return _begin_run(media_pool, import_folder, timeline, settings, progress, emit, run_id)
+
+
+def run_timelines(project, targets, settings, progress, emit, run_id=None):
+    """Place each target's mappings on its own timeline in one run
+
+    targets: [{'name': timeline name, 'mappings': [...], 'settings': {...},
+    'create': bool}]; a target's settings (videoTrack, fps, ...) override
+    the shared ones. Files are imported once and reused by every later
+    timeline. AppendToTimeline only places on the current timeline, so each
+    one is made current in turn and the one that was open is restored.
+    Target i is journaled as <run_id>-<i>; settings['resume'] resumes them all.
+    """
+    if settings.get('resume'):
+        try:
+            journal.journal_path(settings['resume'])
+        except journal.JournalError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+    timelines = {}
+    for index in range(1, (project.GetTimelineCount() or 0) + 1):
+        timeline = project.GetTimelineByIndex(index)
+        if timeline:
+            timelines.setdefault(timeline.GetName(), timeline)
+
+    original = project.GetCurrentTimeline()
+    media_pool = project.GetMediaPool()
+
+    # Resolve every name before doing any work, so a typo fails fast
+    missing = [target.get('name') for target in targets
+               if target.get('name') not in timelines and not target.get('create')]
+    if missing:
+        return {
+            'success': False,
+            'message': f"Timeline(s) not found: {', '.join(str(name) for name in missing)}"
+        }
+    for target in targets:
+        name = target.get('name')
+        if name not in timelines:
+            # In the root bin, not wherever the last run left the current folder
+            media_pool.SetCurrentFolder(media_pool.GetRootFolder())
+            timeline = media_pool.CreateEmptyTimeline(name)
+            if not timeline:
+                return {
+                    'success': False,
+                    'message': f"Could not create timeline '{name}'"
+                }
+            timelines[name] = timeline
+
+    # Same for settings: fail before the first timeline is touched, not halfway
+    for target in targets:
+        try:
+            read_timing(timelines[target['name']], dict(settings, **(target.get('settings') or {})))
+        except (TypeError, ValueError) as e:
+            return {
+                'success': False,
+                'message': f"Invalid settings for timeline '{target['name']}': {e}"
+            }
+
+    media_pool, import_folder = _open_bin(project, progress)
+
+    # Every pass of a resumed request journals into the family it resumes,
+    # so a second crash is still resumable with the same run ID
+    family = settings.get('resume') or run_id
+
+    results = []
+    runs = []
+    shared = None
+    try:
+        for i, target in enumerate(targets):
+            name = target['name']
+            target_settings = dict(settings, **(target.get('settings') or {}))
+            if settings.get('resume'):
+                # A target the crashed run never reached starts fresh
+                resume_id = f"{settings['resume']}-{i}"
+                if journal.exists(resume_id):
+                    target_settings['resume'] = resume_id
+                else:
+                    target_settings.pop('resume')
+
+            emit('timeline', name=name, index=i)
+            if not project.SetCurrentTimeline(timelines[name]):
+                result = {
+                    'success': False,
+                    'message': f"Could not switch to timeline '{name}'"
+                }
+            else:
+                result, run = _run_on_timeline(
+                    media_pool,
+                    import_folder,
+                    timelines[name],
+                    target.get('mappings', []),
+                    target_settings,
+                    progress,
+                    emit,
+                    f'{family}-{i}' if family else None,
+                    shared
+                )
+                if run:
+                    runs.append(run)
+                    shared = run
+            results.append(dict(result, timeline=name))
+    finally:
+        if original:
+            project.SetCurrentTimeline(original)
+
+    # Imports are shared, so count each file once: a clip a later timeline
+    # used again was imported (or reused from the bin) by the first one
+    failed = [result for result in results if not result['success']]
+    combined = {
+        'success': not failed,
+        'imported': len(set().union(*(run.imported_keys for run in runs))),
+        'reused': len(set().union(*(run.reused_keys for run in runs))),
+        'deduplicated': len(runs[-1].aliases) if runs else 0,
+        'placed': sum(result.get('placed', 0) for result in results),
+        'total': sum(result.get('total', 0) for result in results),
+        'importErrors': [
+            f"{result['timeline']}: {error}" for result in results for error in result.get('importErrors', [])
+        ],
+        'placementErrors': [
+            f"{result['timeline']}: {error}" for result in results for error in result.get('placementErrors', [])
+        ],
+        'timelines': results
+    }
+    if failed:
+        combined['message'] = '; '.join(f"{result['timeline']}: {result.get('message')}" for result in failed)
+    if family and settings.get('journal', True):
+        combined['runId'] = family
+    return combined
+
+
+def _open_bin(project, progress):
+    """Media pool and the images bin, made the current folder for imports"""
+    progress.set_phase('bins')
+    media_pool = project.GetMediaPool()
+    root_folder = media_pool.GetRootFolder()
+
+    # Reuse the images bin from earlier runs instead of adding another one
+    import_folder = resolve_batch.find_or_create_bin(media_pool, root_folder, IMPORT_BIN_NAME)
+    if not import_folder:
+        import_folder = root_folder
+
+    media_pool.SetCurrentFolder(import_folder)
+    return media_pool, import_folder
+
+
+def _run_on_timeline(media_pool, import_folder, timeline, mappings, settings, progress, emit,
+                     run_id=None, shared=None):
+    """One timeline's import and placement; returns (response, PlacementRun or None)"""
+    run = _begin_run(media_pool, import_folder, timeline, settings, progress, emit, run_id, shared)
+    if isinstance(run, dict):
+        return run, None
+    return _finish_run(run, mappings, settings), run
+
+
+def _begin_run(media_pool, import_folder, timeline, settings, progress, emit, run_id=None, shared=None):
+    """Check the settings and the journal being resumed and create the PlacementRun; returns it, or an error response"""
+    # Bad input is the caller's error, not Resolve's: answer before journaling anything
+    try:
+        timing = read_timing(timeline, settings)
+        video_track = int(settings.get('videoTrack', 2))
+    except (TypeError, ValueError) as e:
+        return {
+            'success': False,
+            'message': f'Invalid settings: {e}'
+        }
+
+    resumed = None
+    if settings.get('resume'):
+        try:
+            resumed = journal.load(settings['resume'])
+        except journal.JournalError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+        timeline_name = timeline.GetName()
+        if resumed.timeline and resumed.timeline != timeline_name:
+            return {
+                'success': False,
+                'message': f"Run {resumed.run_id} was placed on timeline '{resumed.timeline}', "
+                           f"not '{timeline_name}'; open that timeline to resume it"
+            }
+        if resumed.track is not None and resumed.track != video_track:
+            return {
+                'success': False,
+                'message': f'Run {resumed.run_id} was placed on video track {resumed.track}'
+            }
+
+    run_journal = None
+    journal_id = resumed.run_id if resumed else run_id
+    if journal_id and settings.get('journal', True):
+        run_journal = journal.Journal(journal_id)
+        run_journal.start(timeline.GetName(), video_track, resumed=bool(resumed))
+
+    try:
+        run = PlacementRun(media_pool, import_folder, timeline, settings, progress, emit,
+                           run_journal, resumed, shared, timing)
+        if resumed and not run.sync:
+            run.recover_pending()
+    except Exception:
+        if run_journal:
+            run_journal.close()
+        raise
+    return run
+
+
+def _finish_run(run, mappings, settings):
+    """Place every chunk and close the run's journal; returns the response"""
+    try:
+        result = _place_chunks(run, mappings, settings)
+        if run.journal:
+            run.journal.done(result['success'])
+        return result
+    finally:
+        if run.journal:
+            run.journal.close()
+
+
+def _place_chunks(run, mappings, settings):
+    """Import and place mappings chunk by chunk, returning the run's response
+
+    A streamed manifest is read here, on the calling thread; only each
+    chunk's Resolve work is handed to the executor, so a slow upload never
+    holds up other Resolve calls (the status poller included).
+    """
+    # A list is one chunk (fewest Resolve calls); a stream is worked through
+    # as it is read, so the whole manifest never sits in memory
+    open_ended = not isinstance(mappings, (list, tuple))
+    if open_ended:
+        chunk_size = int(settings.get('importBatchSize') or resolve_batch.DEFAULT_IMPORT_BATCH_SIZE)
+        chunks = resolve_batch.chunked_iter(mappings, chunk_size)
+    else:
+        chunks = iter([mappings])
+
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except ValueError as e:
+            # Bad row further down a streamed manifest; earlier chunks stay placed
+            return dict(run.result(), success=False, message=f'Invalid manifest: {e}')
+        if chunk is None:
+            break
+        failed = resolve_executor.run(_place_chunk, run, chunk, open_ended)
+        if failed:
+            return failed
+
+    return resolve_executor.run(_finish_placement, run)
+
+
+def _place_chunk(run, chunk, open_ended):
+    """Import and place one chunk; returns an error response if preflight stops the run"""
+    run.total += len(chunk)
+    try:
+        run.import_chunk(chunk, open_ended)
+    except PreflightFailed as e:
+        return {
+            'success': False,
+            'message': f'Preflight failed: {e}',
+            'preflightErrors': [f"#{nr}: {message}" for nr, message in e.failures]
+        }
+    indices = run.build_clips(chunk)
+    if not run.sync:
+        run.place(indices, open_ended)
+    return None
+
+
+def _finish_placement(run):
+    # Sync needs the whole manifest before it can tell what to delete
+    if run.sync:
+        run.place(run.sync_track())
+
+    run.progress.set_phase('done')
+    return run.result()
@@ -0,0 +1,292 @@
+"""
+Image preflight
+Header-only probes run on a thread pool before anything reaches Resolve:
+format, dimensions, colour mode, zero-byte and truncated files. Results are
+cached by (path, size, mtime) so unchanged files are never read twice.
+"""
+
+import concurrent.futures
+import os
+import struct
+import threading
+
+# Probes are I/O bound (often on network shares), so use plenty of threads
+MAX_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Cached probe results, oldest dropped first
+MAX_CACHE_ENTRIES = 50000
+
+# JPEG headers (EXIF, ICC profiles) rarely go past this
+JPEG_HEADER_LIMIT = 1024 * 1024
+
+# Tail checked for the JPEG end-of-image marker before scanning the whole file
+JPEG_TAIL_SIZE = 4096
+
+# Block size when scanning a JPEG for a marker that isn't in its tail
+SCAN_BLOCK_SIZE = 1024 * 1024
+
+EXTENSION_FORMATS = {
+    'png': 'PNG',
+    'jpg': 'JPEG',
+    'jpeg': 'JPEG',
+    'webp': 'WEBP',
+    'tif': 'TIFF',
+    'tiff': 'TIFF',
+    'bmp': 'BMP',
+}
+
+PNG_MODES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+TIFF_PHOTOMETRIC = {0: 'L', 1: 'L', 2: 'RGB', 3: 'P', 5: 'CMYK', 6: 'YCbCr'}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ProbeError(Exception):
+    """File is unreadable, corrupt or truncated"""
+
+
+def _png_end(f, size):
+    """Offset just past the IEND chunk, found by walking the chunk headers"""
+    offset = 8
+    while offset + 12 <= size:
+        f.seek(offset)
+        length, chunk_type = struct.unpack('>I4s', f.read(8))
+        offset += 12 + length
+        if chunk_type == b'IEND':
+            return offset
+    raise ProbeError('Truncated PNG (no IEND chunk)')
+
+
+def _probe_png(f, size):
+    head = f.read(33)
+    if len(head) < 33 or head[12:16] != b'IHDR':
+        raise ProbeError('Corrupt PNG header')
+    width, height, depth, color_type = struct.unpack('>IIBB', head[16:26])
+    mode = PNG_MODES.get(color_type)
+    if mode is None:
+        raise ProbeError(f'Corrupt PNG header (colour type {color_type})')
+    # IEND is almost always the last 12 bytes; only walk the chunks when it isn't
+    f.seek(size - 12)
+    if f.read(12)[4:8] == b'IEND':
+        return width, height, mode, depth, 0
+    return width, height, mode, depth, size - _png_end(f, size)
+
+
+def _jpeg_end(f, start):
+    """Offset just past the first end-of-image marker after start
+
+    Entropy-coded data never contains FF D9 (FF bytes are stuffed), so the
+    first one after the frame header ends the image.
+    """
+    f.seek(start)
+    offset = start
+    previous = b''
+    while True:
+        block = f.read(SCAN_BLOCK_SIZE)
+        if not block:
+            raise ProbeError('Truncated JPEG (no end-of-image marker)')
+        found = (previous + block).find(b'\xff\xd9')
+        if found != -1:
+            return offset - len(previous) + found + 2
+        offset += len(block)
+        previous = block[-1:]
+
+
+def _probe_jpeg(f, size):
+    f.seek(2)
+    while f.tell() < min(size, JPEG_HEADER_LIMIT):
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ProbeError('Corrupt JPEG marker')
+        code = marker[1]
+        if code == 0xFF:
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            break
+        length = struct.unpack('>H', length_bytes)[0]
+        # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            depth, height, width, components = struct.unpack('>BHHB', f.read(6))
+            mode = JPEG_MODES.get(components, f'{components}ch')
+            frame_end = f.tell()
+            f.seek(max(0, size - JPEG_TAIL_SIZE))
+            if b'\xff\xd9' in f.read():
+                return width, height, mode, depth, 0
+            # Trailer after the image (phone/camera metadata): find the real end
+            return width, height, mode, depth, size - _jpeg_end(f, frame_end)
+        f.seek(length - 2, os.SEEK_CUR)
+    raise ProbeError('Truncated JPEG (no frame header)')
+
+
+def _probe_webp(f, size):
+    head = f.read(30)
+    if len(head) < 30 or head[8:12] != b'WEBP':
+        raise ProbeError('Corrupt WebP header')
+    riff_size = struct.unpack('<I', head[4:8])[0]
+    if riff_size + 8 > size:
+        raise ProbeError('Truncated WebP')
+    chunk = head[12:16]
+    if chunk == b'VP8X':
+        alpha = head[20] & 0x10
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+    elif chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        alpha = (bits >> 28) & 1
+    elif chunk == b'VP8 ':
+        width = struct.unpack('<H', head[26:28])[0] & 0x3FFF
+        height = struct.unpack('<H', head[28:30])[0] & 0x3FFF
+        alpha = 0
+    else:
+        raise ProbeError('Corrupt WebP header')
+    return width, height, 'RGBA' if alpha else 'RGB', 8, 0
+
+
+def _probe_bmp(f, size):
+    head = f.read(30)
+    if len(head) < 30:
+        raise ProbeError('Corrupt BMP header')
+    file_size, pixel_offset = struct.unpack('<I4xI', head[2:14])
+    width, height, _, bit_count = struct.unpack('<iiHH', head[18:30])
+    if (file_size and file_size > size) or pixel_offset >= size:
+        raise ProbeError('Truncated BMP')
+    mode = {1: 'P', 4: 'P', 8: 'P', 24: 'RGB', 32: 'RGBA'}.get(bit_count, 'RGB')
+    return width, abs(height), mode, 8, 0
+
+
+def _probe_tiff(f, size):
+    head = f.read(8)
+    endian = '<' if head[:2] == b'II' else '>'
+    ifd_offset = struct.unpack(endian + 'I', head[4:8])[0]
+    if ifd_offset + 2 > size:
+        raise ProbeError('Truncated TIFF')
+    f.seek(ifd_offset)
+    count = struct.unpack(endian + 'H', f.read(2))[0]
+    entries = f.read(count * 12)
+    if len(entries) < count * 12:
+        raise ProbeError('Truncated TIFF')
+
+    tags = {}
+    for i in range(count):
+        tag, field_type, value_count = struct.unpack(endian + 'HHI', entries[i * 12:i * 12 + 8])
+        if value_count != 1:
+            continue
+        if field_type == 3:  # SHORT
+            tags[tag] = struct.unpack(endian + 'H', entries[i * 12 + 8:i * 12 + 10])[0]
+        elif field_type == 4:  # LONG
+            tags[tag] = struct.unpack(endian + 'I', entries[i * 12 + 8:i * 12 + 12])[0]
+
+    if 256 not in tags or 257 not in tags:
+        raise ProbeError('Corrupt TIFF header (no dimensions)')
+    # Single-strip images: the strip has to fit in the file
+    if 273 in tags and 279 in tags and tags[273] + tags[279] > size:
+        raise ProbeError('Truncated TIFF')
+    mode = TIFF_PHOTOMETRIC.get(tags.get(262), 'RGB')
+    if mode == 'RGB' and tags.get(277, 3) == 4:
+        mode = 'RGBA'
+    return tags[256], tags[257], mode, tags.get(258, 8), 0
+
+
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'PNG', _probe_png),
+    (b'\xff\xd8', 'JPEG', _probe_jpeg),
+    (b'RIFF', 'WEBP', _probe_webp),
+    (b'BM', 'BMP', _probe_bmp),
+    (b'II*\x00', 'TIFF', _probe_tiff),
+    (b'MM\x00*', 'TIFF', _probe_tiff),
+]
+
+
+def probe(path, size=None):
+    """Read just enough of an image to describe and sanity-check it"""
+    result = {
+        'ok': False,
+        'format': None,
+        'width': None,
+        'height': None,
+        'mode': None,
+        'bitDepth': None,
+        'size': size,
+        'error': None,
+        'warnings': []
+    }
+
+    try:
+        if size is None:
+            size = result['size'] = os.stat(path).st_size
+        if size == 0:
+            result['error'] = 'Empty file (0 bytes)'
+            return result
+
+        with open(path, 'rb') as f:
+            magic = f.read(8)
+            for signature, image_format, reader in SIGNATURES:
+                if magic.startswith(signature):
+                    f.seek(0)
+                    width, height, mode, depth, trailing = reader(f, size)
+                    break
+            else:
+                result['error'] = 'Unrecognized image format'
+                return result
+    except ProbeError as e:
+        result['error'] = str(e)
+        return result
+    except (OSError, struct.error) as e:
+        result['error'] = f'Unreadable: {e}'
+        return result
+
+    result.update({'format': image_format, 'width': width, 'height': height, 'mode': mode, 'bitDepth': depth})
+
+    if not width or not height:
+        result['error'] = 'Image has zero width or height'
+        return result
+
+    ext = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    expected = EXTENSION_FORMATS.get(ext)
+    if expected and expected != image_format:
+        result['warnings'].append(f'.{ext} file contains {image_format} data')
+    if mode == 'CMYK':
+        result['warnings'].append('CMYK colour may display incorrectly in Resolve')
+    if trailing:
+        result['warnings'].append(f'{trailing} bytes of extra data after the end of the image')
+
+    result['ok'] = True
+    return result
+
+
+def probe_cached(path):
+    """probe() with results reused while the file's size and mtime are unchanged"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {'ok': False, 'error': 'File not found', 'warnings': []}
+
+    key = (path, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = probe(path, st.st_size)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+    return result
+
+
+def preflight(paths, max_workers=MAX_WORKERS):
+    """Probe many files in parallel; returns {path: result}"""
+    unique = list(dict.fromkeys(paths))
+    if len(unique) <= 1:
+        return {path: probe_cached(path) for path in unique}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+        return dict(zip(unique, pool.map(probe_cached, unique)))
@@ -0,0 +1,85 @@
+"""
+Per-request profiling for ?profile=1
+A RequestProfile is a progress sink that times each phase of one request,
+optionally with cProfile top-N stats. Only created when a request asks for
+it, so normal requests don't pay anything.
+"""
+
+import cProfile
+import pstats
+import time
+
+# Upper bound for ?top=
+MAX_TOP = 100
+
+
+class RequestProfile:
+    """Phase timings (and optional cProfile stats) for one request"""
+
+    def __init__(self, top=0):
+        self.top = min(max(top, 0), MAX_TOP)
+        self._profiler = cProfile.Profile() if self.top else None
+        self._profiler_error = None
+        self._started = time.perf_counter()
+        # Time until the first set_phase() is spent waiting for the Resolve executor
+        self._phase = 'queue'
+        self._phase_start = self._started
+        self._finished = None
+        self.phases = {}
+
+    def set_phase(self, phase, total=None, open_ended=False):
+        now = time.perf_counter()
+        if self._phase:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + (now - self._phase_start)
+        self._phase = None if phase == 'done' else phase
+        self._phase_start = now
+
+    def advance(self, count=1):
+        pass
+
+    def call(self, func, *args, **kwargs):
+        """Run func under cProfile when top-N stats were requested"""
+        if not self._profiler:
+            return func(*args, **kwargs)
+        try:
+            self._profiler.enable()
+        except ValueError as e:
+            # Another profiler is active (e.g. a concurrent ?profile request)
+            self._profiler_error = str(e)
+            self._profiler = None
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._profiler.disable()
+
+    def finish(self):
+        self.set_phase('done')
+        self._finished = time.perf_counter()
+
+    def to_dict(self):
+        if self._finished is None:
+            self.finish()
+        result = {
+            'totalMs': round((self._finished - self._started) * 1000, 2),
+            'phases': {phase: round(seconds * 1000, 2) for phase, seconds in self.phases.items()}
+        }
+        if self._profiler:
+            result['top'] = self._top_functions()
+        elif self._profiler_error:
+            result['top'] = None
+            result['profilerError'] = self._profiler_error
+        return result
+
+    def _top_functions(self):
+        stats = pstats.Stats(self._profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [
+            {
+                'function': f'{func}' if filename == '~' else f'{filename}:{line}({func})',
+                'calls': calls,
+                'ownMs': round(own * 1000, 3),
+                'cumulativeMs': round(cumulative * 1000, 3)
+            }
+            for (filename, line, func), (_, calls, own, cumulative, _) in rows
+        ]
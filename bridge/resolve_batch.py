@@ -0,0 +1,132 @@
+"""
+Batched DaVinci Resolve API calls
+Every Resolve call is a round trip through fusionscript, so the bridge
+sends lists instead of one call per image
+"""
+
+import os
+
+# Paths per ImportMedia call when the request doesn't say otherwise
+DEFAULT_IMPORT_BATCH_SIZE = 250
+MAX_IMPORT_BATCH_SIZE = 1000
+
+# Clips per AppendToTimeline call
+DEFAULT_PLACEMENT_BATCH_SIZE = 200
+
+
+def path_key(path):
+    """Normalize a file path so Resolve's paths compare equal to ours"""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def auto_batch_size(total, requested=None):
+    """Pick ImportMedia chunk size: whole manifest if small, else even chunks"""
+    if requested:
+        return max(1, int(requested))
+    if total <= DEFAULT_IMPORT_BATCH_SIZE:
+        return max(1, total)
+    chunks = -(-total // MAX_IMPORT_BATCH_SIZE)
+    return -(-total // chunks)
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def chunked_iter(iterable, size):
+    """Like chunked(), for iterators whose length isn't known up front"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_media_batched(media_pool, paths, batch_size=None):
+    """
+    Import files with as few ImportMedia calls as possible
+    Returns (items_by_path_key, failed_paths). Files a batch silently
+    skipped are retried one by one so failures are still per file.
+    """
+    unique = []
+    seen = set()
+    for path in paths:
+        key = path_key(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+
+    items_by_key = {}
+    unmatched = []
+
+    for batch in chunked(unique, auto_batch_size(len(unique), batch_size)):
+        items = media_pool.ImportMedia(batch) or []
+        for item in items:
+            clip_path = item.GetClipProperty('File Path')
+            if clip_path:
+                items_by_key.setdefault(path_key(clip_path), item)
+        unmatched.extend(p for p in batch if path_key(p) not in items_by_key)
+
+    # Batch results can't say which file was rejected, so ask per file
+    failed = []
+    for path in unmatched:
+        items = media_pool.ImportMedia([path])
+        if items and len(items) > 0:
+            items_by_key[path_key(path)] = items[0]
+        else:
+            failed.append(path)
+
+    return items_by_key, failed
+
+
+def append_to_timeline_batched(media_pool, clip_infos, batch_size=None):
+    """
+    Append clips with one AppendToTimeline call per batch
+    Returns a list parallel to clip_infos holding the TimelineItem that was
+    created for each clip, or None where Resolve didn't place it.
+    """
+    size = max(1, int(batch_size or DEFAULT_PLACEMENT_BATCH_SIZE))
+    placed = []
+
+    for batch in chunked(clip_infos, size):
+        items = media_pool.AppendToTimeline(batch) or []
+
+        if len(items) == len(batch):
+            # Resolve returns one item per clipInfo, in order
+            placed.extend(items)
+        else:
+            # Some clips were dropped: match the rest by record frame
+            by_start = {}
+            for item in items:
+                by_start.setdefault(item.GetStart(), []).append(item)
+            for clip_info in batch:
+                candidates = by_start.get(clip_info.get('recordFrame'))
+                placed.append(candidates.pop(0) if candidates else None)
+
+    return placed
+
+
+def find_or_create_bin(media_pool, parent, name):
+    """Return the subfolder of parent called name, creating it only if missing"""
+    for folder in parent.GetSubFolderList() or []:
+        if folder.GetName() == name:
+            return folder
+    return media_pool.AddSubFolder(parent, name)
+
+
+def index_folder_clips(folder):
+    """Walk folder and its subfolders once, keying MediaPoolItems by file path"""
+    items_by_key = {}
+    pending = [folder]
+    while pending:
+        current = pending.pop()
+        for item in current.GetClipList() or []:
+            clip_path = item.GetClipProperty('File Path')
+            if clip_path:
+                items_by_key.setdefault(path_key(clip_path), item)
+        pending.extend(current.GetSubFolderList() or [])
+    return items_by_key
@@ -0,0 +1,44 @@
+"""
+Dedicated Resolve executor
+fusionscript isn't safe to drive from several threads at once, so every
+Resolve call is queued onto one long-lived thread. Request threads that
+don't touch Resolve (cached /status, folder lookups) never wait on it.
+"""
+
+import concurrent.futures
+import threading
+
+THREAD_NAME = 'resolve-executor'
+
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=THREAD_NAME)
+_local = threading.local()
+
+
+def _mark_and_call(fn, args, kwargs):
+    _local.on_executor = True
+    return fn(*args, **kwargs)
+
+
+def on_executor_thread():
+    return getattr(_local, 'on_executor', False)
+
+
+def submit(fn, *args, **kwargs):
+    """Queue fn on the Resolve thread and return a Future"""
+    return _executor.submit(_mark_and_call, fn, args, kwargs)
+
+
+def run(fn, *args, **kwargs):
+    """Run fn on the Resolve thread and wait for its result
+
+    Calls made from the Resolve thread itself run inline, so nested helpers
+    can use run() without deadlocking.
+    """
+    if on_executor_thread():
+        return fn(*args, **kwargs)
+    return submit(fn, *args, **kwargs).result()
+
+
+def queue_depth():
+    """Commands waiting behind the one currently running"""
+    return _executor._work_queue.qsize()
@@ -0,0 +1,119 @@
+"""
+Persistent DaVinci Resolve session
+Keeps the scriptapp handle alive across requests, revalidates it cheaply
+and reconnects transparently when Resolve was restarted
+"""
+
+import threading
+import time
+
+# Seconds a validated project/timeline is trusted without asking Resolve again
+DEFAULT_MAX_AGE = 1.0
+
+
+class ResolveSession:
+    """Cached Resolve -> ProjectManager -> Project -> Timeline chain"""
+
+    def __init__(self, connect, max_age=DEFAULT_MAX_AGE):
+        self._connect = connect
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._resolve = None
+        self._project_manager = None
+        self._project = None
+        self._timeline = None
+        self._info = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        """Forget every cached handle; the next call reconnects"""
+        with self._lock:
+            self._resolve = None
+            self._project_manager = None
+            self._clear_project()
+            self._checked_at = 0.0
+
+    def _clear_project(self):
+        self._project = None
+        self._timeline = None
+        self._info = None
+
+    def _reconnect(self):
+        self._resolve = self._connect()
+        self._project_manager = self._resolve.GetProjectManager() if self._resolve else None
+
+    def _walk(self):
+        project = self._project_manager.GetCurrentProject()
+        timeline = project.GetCurrentTimeline() if project else None
+        return project, timeline
+
+    def _validate(self):
+        if self._project_manager is None:
+            self._reconnect()
+            if self._project_manager is None:
+                self._clear_project()
+                return
+            project, timeline = self._walk()
+        else:
+            # A handle from before a Resolve restart either raises or
+            # returns None, so retry once on a fresh connection
+            try:
+                project, timeline = self._walk()
+            except Exception:
+                project = None
+            if project is None:
+                self._reconnect()
+                if self._project_manager is None:
+                    self._clear_project()
+                    return
+                project, timeline = self._walk()
+
+        info = {
+            'project': None,
+            'timeline': None,
+            'fps': None
+        }
+        if project:
+            info['project'] = project.GetName()
+            if timeline:
+                info['timeline'] = timeline.GetName()
+                info['fps'] = timeline.GetSetting('timelineFrameRate')
+
+        self._project = project
+        self._timeline = timeline
+        self._info = info
+
+    def _ensure_fresh(self, max_age):
+        if max_age is None:
+            max_age = self.max_age
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at <= max_age:
+            return
+        try:
+            self._validate()
+        except Exception:
+            self.invalidate()
+            raise
+        self._checked_at = now
+
+    def current(self, max_age=None):
+        """Return (resolve, project, timeline), any of which may be None"""
+        with self._lock:
+            self._ensure_fresh(max_age)
+            return self._resolve, self._project, self._timeline
+
+    def info(self, max_age=None):
+        """Return connection summary used by /status"""
+        with self._lock:
+            self._ensure_fresh(max_age)
+            data = {
+                'resolveConnected': self._project is not None,
+                'project': None,
+                'timeline': None
+            }
+            if self._info:
+                data['project'] = self._info['project']
+                data['timeline'] = self._info['timeline']
+                if self._info['timeline']:
+                    data['fps'] = self._info['fps']
+            return data
@@ -0,0 +1,350 @@
+"""
+In-process stand-in for the DaVinciResolveScript module
+Fake Resolve -> ProjectManager -> Project -> MediaPool / Timeline object
+graph that keeps bin and track state, with per-call latency, failure
+injection and call counters, so the bridge can be load-tested and
+profiled without Resolve. Start the bridge with --simulate (or set
+DAVINCI_BRIDGE_SIMULATE=1) to use it.
+"""
+
+import collections
+import os
+import random
+import threading
+import time
+
+# Per-call cost in seconds: method -> (fixed, per item for batch calls)
+DEFAULT_LATENCY = {
+    'ImportMedia': (0.030, 0.003),
+    'AppendToTimeline': (0.015, 0.0015),
+    'DeleteClips': (0.010, 0.0005),
+    'GetItemListInTrack': (0.005, 0.00005),
+    'GetClipList': (0.002, 0.00002),
+    'AddSubFolder': (0.005, 0),
+    'GetClipProperty': (0.0005, 0),
+}
+DEFAULT_CALL_LATENCY = (0.0003, 0)
+
+# Calls whose failure rate drops single items instead of failing the call
+BATCH_METHODS = ('ImportMedia', 'AppendToTimeline')
+
+# Formats the fake ImportMedia accepts; anything else is silently skipped like Resolve does
+IMPORTABLE_EXTENSIONS = ('png', 'jpg', 'jpeg', 'tif', 'tiff', 'bmp', 'dpx', 'exr')
+
+
+class Simulator:
+    """Configuration, counters and state shared by every fake API object
+
+    latency: {method: (fixed, per_item)} overrides, scaled by latency_scale.
+    failures: {method: rate}; batch calls (ImportMedia, AppendToTimeline)
+    drop each item with that probability, other calls fail (return None /
+    False) as a whole.
+    """
+
+    def __init__(self, latency=None, failures=None, latency_scale=1.0, seed=None):
+        self.latency = dict(DEFAULT_LATENCY, **(latency or {}))
+        self.latency_scale = latency_scale
+        self.failures = dict(failures or {})
+        self.random = random.Random(seed)
+        self.calls = collections.Counter()
+        self.lock = threading.RLock()
+        self.connected = True
+        self.reset()
+
+    def reset(self):
+        """Fresh project (one empty 24fps timeline) and zeroed counters"""
+        with self.lock:
+            self.calls.clear()
+            self.resolve = Resolve(self)
+
+    def call(self, method, count=1):
+        """Count and delay one API call; False if it should fail"""
+        fixed, per_item = self.latency.get(method, DEFAULT_CALL_LATENCY)
+        with self.lock:
+            self.calls[method] += 1
+            failed = not self.connected or (
+                method not in BATCH_METHODS and self.random.random() < self.failures.get(method, 0)
+            )
+        delay = (fixed + per_item * count) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return not failed
+
+    def item_fails(self, method):
+        with self.lock:
+            return self.random.random() < self.failures.get(method, 0)
+
+    def disconnect(self):
+        """Simulate Resolve quitting: scriptapp() returns None, old handles fail"""
+        self.connected = False
+
+    def reconnect(self):
+        self.connected = True
+
+
+class MediaPoolItem:
+    def __init__(self, sim, path):
+        self._sim = sim
+        self._path = path
+        self._name = os.path.basename(path)
+
+    def GetName(self):
+        return self._name if self._sim.call('GetName') else None
+
+    def GetClipProperty(self, key=None):
+        if not self._sim.call('GetClipProperty'):
+            return None
+        properties = {'File Path': self._path, 'Clip Name': self._name, 'Type': 'Still'}
+        return properties.get(key, '') if key else properties
+
+
+class Folder:
+    def __init__(self, sim, name):
+        self._sim = sim
+        self._name = name
+        self._clips = []
+        self._subfolders = []
+
+    def GetName(self):
+        return self._name if self._sim.call('GetName') else None
+
+    def GetClipList(self):
+        if not self._sim.call('GetClipList', len(self._clips)):
+            return None
+        return list(self._clips)
+
+    def GetSubFolderList(self):
+        return list(self._subfolders) if self._sim.call('GetSubFolderList') else None
+
+
+class TimelineItem:
+    def __init__(self, sim, media_item, start, duration, track_index):
+        self._sim = sim
+        self._media_item = media_item
+        self._start = start
+        self._duration = duration
+        self._track_index = track_index
+
+    def GetName(self):
+        return self._media_item._name if self._sim.call('GetName') else None
+
+    def GetStart(self):
+        return self._start if self._sim.call('GetStart') else None
+
+    def GetEnd(self):
+        return self._start + self._duration if self._sim.call('GetEnd') else None
+
+    def GetDuration(self):
+        return self._duration if self._sim.call('GetDuration') else None
+
+    def GetMediaPoolItem(self):
+        return self._media_item if self._sim.call('GetMediaPoolItem') else None
+
+
+class Timeline:
+    def __init__(self, sim, name, fps='24', width=1920, height=1080, start_frame=86400):
+        self._sim = sim
+        self._name = name
+        self._start_frame = start_frame
+        self._settings = {
+            'timelineFrameRate': fps,
+            'timelineDropFrameTimecode': '0',
+            'timelineResolutionWidth': str(width),
+            'timelineResolutionHeight': str(height),
+        }
+        self._tracks = collections.defaultdict(list)
+
+    def GetName(self):
+        return self._name if self._sim.call('GetName') else None
+
+    def GetSetting(self, name=None):
+        if not self._sim.call('GetSetting'):
+            return None
+        return self._settings.get(name, '') if name else dict(self._settings)
+
+    def SetSetting(self, name, value):
+        if not self._sim.call('SetSetting'):
+            return False
+        self._settings[name] = str(value)
+        return True
+
+    def GetStartFrame(self):
+        return self._start_frame if self._sim.call('GetStartFrame') else None
+
+    def GetEndFrame(self):
+        if not self._sim.call('GetEndFrame'):
+            return None
+        ends = [item._start + item._duration for items in self._tracks.values() for item in items]
+        return max(ends, default=self._start_frame)
+
+    def GetTrackCount(self, track_type):
+        if not self._sim.call('GetTrackCount'):
+            return None
+        return max(self._tracks, default=1) if track_type == 'video' else 1
+
+    def GetItemListInTrack(self, track_type, index):
+        items = self._tracks.get(index, []) if track_type == 'video' else []
+        if not self._sim.call('GetItemListInTrack', len(items)):
+            return None
+        return sorted(items, key=lambda item: item._start)
+
+    def DeleteClips(self, items, ripple=False):
+        if not self._sim.call('DeleteClips', len(items)):
+            return False
+        doomed = set(map(id, items))
+        with self._sim.lock:
+            for track in self._tracks.values():
+                track[:] = [item for item in track if id(item) not in doomed]
+        return True
+
+    def _append(self, media_item, info):
+        track = info.get('trackIndex', 1)
+        start = info.get('startFrame', 0)
+        duration = info.get('endFrame', start + 1) - start
+        record = info.get('recordFrame')
+        if record is None:
+            record = max((i._start + i._duration for i in self._tracks[track]), default=self._start_frame)
+        item = TimelineItem(self._sim, media_item, record, duration, track)
+        self._tracks[track].append(item)
+        return item
+
+
+class MediaPool:
+    def __init__(self, sim, project):
+        self._sim = sim
+        self._project = project
+        self._root = Folder(sim, 'Master')
+        self._current = self._root
+
+    def GetRootFolder(self):
+        return self._root if self._sim.call('GetRootFolder') else None
+
+    def GetCurrentFolder(self):
+        return self._current if self._sim.call('GetCurrentFolder') else None
+
+    def SetCurrentFolder(self, folder):
+        if not self._sim.call('SetCurrentFolder'):
+            return False
+        self._current = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        if not self._sim.call('AddSubFolder'):
+            return None
+        folder = Folder(self._sim, name)
+        with self._sim.lock:
+            parent._subfolders.append(folder)
+        return folder
+
+    def ImportMedia(self, paths):
+        if not self._sim.call('ImportMedia', len(paths)):
+            return []
+        items = []
+        for path in paths:
+            ext = path.rsplit('.', 1)[-1].lower()
+            if ext not in IMPORTABLE_EXTENSIONS or not os.path.isfile(path):
+                continue
+            if self._sim.item_fails('ImportMedia'):
+                continue
+            items.append(MediaPoolItem(self._sim, path))
+        with self._sim.lock:
+            self._current._clips.extend(items)
+        return items
+
+    def AppendToTimeline(self, clips):
+        if not self._sim.call('AppendToTimeline', len(clips)):
+            return []
+        timeline = self._project._current_timeline
+        if timeline is None:
+            return []
+        items = []
+        with self._sim.lock:
+            for clip in clips:
+                info = clip if isinstance(clip, dict) else {'mediaPoolItem': clip}
+                if self._sim.item_fails('AppendToTimeline'):
+                    continue
+                items.append(timeline._append(info['mediaPoolItem'], info))
+        return items
+
+    def CreateEmptyTimeline(self, name):
+        if not self._sim.call('CreateEmptyTimeline'):
+            return None
+        timeline = Timeline(self._sim, name)
+        with self._sim.lock:
+            self._project._timelines.append(timeline)
+            self._project._current_timeline = timeline
+        return timeline
+
+
+class Project:
+    def __init__(self, sim, name):
+        self._sim = sim
+        self._name = name
+        self._timelines = [Timeline(sim, 'Timeline 1')]
+        self._current_timeline = self._timelines[0]
+        self._media_pool = MediaPool(sim, self)
+
+    def GetName(self):
+        return self._name if self._sim.call('GetName') else None
+
+    def GetMediaPool(self):
+        return self._media_pool if self._sim.call('GetMediaPool') else None
+
+    def GetCurrentTimeline(self):
+        return self._current_timeline if self._sim.call('GetCurrentTimeline') else None
+
+    def SetCurrentTimeline(self, timeline):
+        if not self._sim.call('SetCurrentTimeline') or timeline not in self._timelines:
+            return False
+        self._current_timeline = timeline
+        return True
+
+    def GetTimelineCount(self):
+        return len(self._timelines) if self._sim.call('GetTimelineCount') else None
+
+    def GetTimelineByIndex(self, index):
+        if not self._sim.call('GetTimelineByIndex') or not 1 <= index <= len(self._timelines):
+            return None
+        return self._timelines[index - 1]
+
+
+class ProjectManager:
+    def __init__(self, sim):
+        self._sim = sim
+        self._project = Project(sim, 'Simulated Project')
+
+    def GetCurrentProject(self):
+        return self._project if self._sim.call('GetCurrentProject') else None
+
+
+class Resolve:
+    def __init__(self, sim):
+        self._sim = sim
+        self._project_manager = ProjectManager(sim)
+
+    def GetProductName(self):
+        return 'DaVinci Resolve (simulated)' if self._sim.call('GetProductName') else None
+
+    def GetVersionString(self):
+        return '0.0.0' if self._sim.call('GetVersionString') else None
+
+    def GetProjectManager(self):
+        return self._project_manager if self._sim.call('GetProjectManager') else None
+
+
+# Module-level instance, like the single Resolve a real install talks to
+simulator = Simulator()
+
+
+def configure(**options):
+    """Replace the simulator (new state and counters) with these options"""
+    global simulator
+    simulator = Simulator(**options)
+    return simulator
+
+
+def scriptapp(name):
+    """DaVinciResolveScript.scriptapp(): the Resolve object, or None if 'not running'"""
+    if name != 'Resolve' or not simulator.call('scriptapp'):
+        return None
+    return simulator.resolve
@@ -0,0 +1,96 @@
+"""
+Background status poller
+Refreshes bridge state on an interval so /status can answer from a cached
+snapshot, and wakes long-polling clients only when something changed
+"""
+
+import os
+import threading
+import time
+
+DEFAULT_INTERVAL = 1.0
+MAX_BACKOFF = 30.0
+
+
+class StatusPoller:
+    """Versioned snapshot of whatever refresh() returns"""
+
+    def __init__(self, refresh, is_healthy, interval=DEFAULT_INTERVAL, max_backoff=MAX_BACKOFF):
+        self._refresh = refresh
+        self._is_healthy = is_healthy
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._state = None
+        self._version = 0
+        # Versions restart with the bridge, so ETags carry a boot id too
+        self._boot_id = os.urandom(4).hex()
+
+    def start(self):
+        """Take the first snapshot synchronously, then poll in the background
+
+        Concurrent callers wait for that first snapshot.
+        """
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._poll_once()
+            self._thread = threading.Thread(target=self._run, name='status-poller', daemon=True)
+            self._thread.start()
+
+    def poke(self):
+        """Refresh as soon as possible (e.g. after a placement run)"""
+        self._wake.set()
+
+    def _poll_once(self):
+        state = self._refresh()
+        with self._cond:
+            if state != self._state:
+                self._state = state
+                self._version += 1
+                self._cond.notify_all()
+        return state
+
+    def _run(self):
+        delay = self.interval
+        while True:
+            self._wake.wait(delay)
+            self._wake.clear()
+            try:
+                state = self._poll_once()
+                healthy = self._is_healthy(state)
+            except Exception as e:
+                print(f"Status poller error: {e}")
+                healthy = False
+
+            # Back off while Resolve is down instead of hammering the API
+            if healthy:
+                delay = self.interval
+            else:
+                delay = min(max(delay, self.interval) * 2, self.max_backoff)
+
+    def etag(self, version):
+        return f'"{self._boot_id}-{version}"'
+
+    def snapshot(self):
+        """Return (version, state, etag) for the latest refresh"""
+        with self._cond:
+            return self._version, self._state, self.etag(self._version)
+
+    def wait_for_change(self, since, timeout):
+        """Block until version > since or timeout, then return snapshot()
+
+        A since past the current version was seen before a restart, so the
+        state it describes is gone: answer straight away.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._version == since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.snapshot()
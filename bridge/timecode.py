@@ -0,0 +1,219 @@
+"""
+Frame-exact timecode conversion
+Frame rates are kept as exact fractions (23.976 -> 24000/1001) and every
+clip boundary is rounded to a frame on its own, so adjacent clips always
+tile with no gaps or overlaps, however long the timeline is.
+
+Accepted timestamps:
+  MM:SS, HH:MM:SS        with optional fractional seconds (01:02.5)
+  HH:MM:SS:FF            non-drop-frame timecode (FF below the nominal rate)
+  HH:MM:SS;FF            drop-frame timecode (29.97 / 59.94 only)
+"""
+
+from fractions import Fraction
+
+import lazy_import
+
+# NumPy makes convert_ranges() vectorized; plain Python gives identical results.
+# Imported on first use: it takes longer to load than the rest of the bridge
+numpy_module = lazy_import.LazyModule('numpy')
+
+# Rates Resolve shows rounded, mapped to their exact NTSC values
+NTSC_RATES = {
+    '23.976': Fraction(24000, 1001),
+    '23.98': Fraction(24000, 1001),
+    '29.97': Fraction(30000, 1001),
+    '47.952': Fraction(48000, 1001),
+    '59.94': Fraction(60000, 1001),
+    '119.88': Fraction(120000, 1001),
+}
+
+# Fractional seconds are carried as integer microseconds
+US_PER_SECOND = 1000000
+
+# Nominal rates drop-frame timecode exists for (29.97 and 59.94)
+DROP_FRAME_RATES = (30, 60)
+
+
+def parse_fps(value, default=24):
+    """Parse a frame rate (24, '23.976', '29.97 DF', '30000/1001') to a Fraction"""
+    if value is None or value == '':
+        return Fraction(default)
+    if isinstance(value, Fraction):
+        return value
+    text = str(value).strip().upper().replace('NDF', '').replace('DF', '').strip()
+    if text in NTSC_RATES:
+        return NTSC_RATES[text]
+    try:
+        fps = Fraction(text).limit_denominator(1001)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f'Invalid frame rate: {value}') from None
+    if fps <= 0:
+        raise ValueError(f'Invalid frame rate: {value}')
+    # 23.976023... and friends still mean the NTSC rate
+    for exact in NTSC_RATES.values():
+        if abs(fps - exact) < Fraction(1, 1000):
+            return exact
+    return fps
+
+
+def nominal_fps(fps):
+    """Integer frames-per-second used for timecode labels (29.97 -> 30)"""
+    return round(fps)
+
+
+def check_drop_frame(fps):
+    """Raise ValueError unless drop-frame timecode exists at this rate"""
+    if nominal_fps(fps) not in DROP_FRAME_RATES:
+        raise ValueError(f'Drop-frame timecode needs 29.97 or 59.94 fps, not {float(fps):g}')
+
+
+def parse_time(text, fps, drop_frame=False):
+    """
+    Parse one timestamp
+    Returns ('frames', n) for HH:MM:SS:FF timecode, ('us', n) for clock time
+    """
+    text = text.strip()
+    parts = text.replace(';', ':').split(':')
+
+    if len(parts) == 4:
+        h, m, s, f = (int(p) for p in parts)
+        base = nominal_fps(fps)
+        if min(h, m, s, f) < 0 or m >= 60 or s >= 60 or f >= base:
+            raise ValueError(f'Invalid timecode at {base} fps: {text}')
+        if ';' in text:
+            drop_frame = True
+        if drop_frame:
+            check_drop_frame(fps)
+            # Labels :00 and :01 (:00-:03 at 59.94) are skipped every minute but every 10th
+            if s == 0 and f < base // 15 and m % 10:
+                raise ValueError(f'Timecode {text} does not exist in drop-frame')
+        return 'frames', timecode_to_frames(h, m, s, f, fps, drop_frame)
+
+    if len(parts) == 2:  # MM:SS
+        h, m, s = 0, int(parts[0]), parts[1]
+    elif len(parts) == 3:  # HH:MM:SS
+        h, m, s = int(parts[0]), int(parts[1]), parts[2]
+    else:
+        raise ValueError(f'Invalid timestamp: {text}')
+
+    whole, _, decimals = s.strip().partition('.')
+    if m < 0 or h < 0 or not whole.isdigit() or (decimals and not decimals.isdigit()):
+        raise ValueError(f'Invalid timestamp: {text}')
+    if len(decimals) > 6:
+        # Beyond microseconds: round exactly rather than truncate
+        us = round(Fraction(f'{whole}.{decimals}') * US_PER_SECOND)
+    else:
+        us = int(whole) * US_PER_SECOND + int(decimals.ljust(6, '0') or 0)
+    return 'us', (h * 3600 + m * 60) * US_PER_SECOND + us
+
+
+def timecode_to_frames(h, m, s, f, fps, drop_frame=False):
+    """Frame count for a timecode label, honouring drop-frame numbering"""
+    base = nominal_fps(fps)
+    frames = (h * 3600 + m * 60 + s) * base + f
+    if drop_frame:
+        # 2 labels dropped per minute at 29.97 (4 at 59.94), except every 10th
+        dropped = base // 15
+        total_minutes = h * 60 + m
+        frames -= dropped * (total_minutes - total_minutes // 10)
+    return frames
+
+
+def us_to_frame(us, fps):
+    """Nearest frame to a time in microseconds (exact integer rounding)"""
+    num, den = fps.numerator, fps.denominator * US_PER_SECOND
+    return (2 * us * num + den) // (2 * den)
+
+
+def to_frame(text, fps, drop_frame=False):
+    """Convert one timestamp to a 0-based frame number"""
+    fps = parse_fps(fps)
+    kind, value = parse_time(text, fps, drop_frame)
+    return value if kind == 'frames' else us_to_frame(value, fps)
+
+
+def frames_to_timecode(frame, fps, drop_frame=False):
+    """Format a 0-based frame number as HH:MM:SS:FF (HH:MM:SS;FF if drop-frame)"""
+    fps = parse_fps(fps)
+    base = nominal_fps(fps)
+    if drop_frame:
+        dropped = base // 15
+        per_minute = base * 60 - dropped
+        per_ten = per_minute * 10 + dropped
+        tens, rest = divmod(frame, per_ten)
+        extra = 0 if rest < dropped else dropped * ((rest - dropped) // per_minute)
+        frame += dropped * 9 * tens + extra
+    f = frame % base
+    s = frame // base % 60
+    m = frame // (base * 60) % 60
+    h = frame // (base * 3600)
+    sep = ';' if drop_frame else ':'
+    return f'{h:02d}:{m:02d}:{s:02d}{sep}{f:02d}'
+
+
+def split_range(timestamp):
+    """Split '00:00-00:06' (or with en dash / spaces) into (start, end)"""
+    text = timestamp.replace('–', '-')
+    if text.count('-') != 1:
+        raise ValueError(f'Invalid timestamp format: {timestamp}')
+    start, end = text.split('-')
+    return start.strip(), end.strip()
+
+
+def convert_ranges(ranges, fps, offset=0, drop_frame=False):
+    """
+    Convert a whole manifest of 'start-end' ranges in one call
+    Returns (starts, durations, errors): starts are record frames including
+    offset (the timeline's start frame), durations are in frames, and errors
+    maps row index -> message for rows that couldn't be converted (their
+    start/duration are -1). Lists, or NumPy arrays when NumPy is installed.
+    """
+    fps = parse_fps(fps)
+    count = len(ranges)
+    kinds = bytearray(count * 2)  # 1 = already frames, 0 = microseconds
+    values = [0] * (count * 2)
+    errors = {}
+
+    for i, timestamp in enumerate(ranges):
+        try:
+            for j, part in enumerate(split_range(timestamp or '')):
+                kind, value = parse_time(part, fps, drop_frame)
+                kinds[2 * i + j] = kind == 'frames'
+                values[2 * i + j] = value
+        except (ValueError, ZeroDivisionError) as e:
+            errors[i] = str(e)
+
+    np = numpy_module.get()
+    if np is not None:
+        starts, durations = _frames_numpy(np, kinds, values, fps, offset)
+        backwards = np.flatnonzero(durations <= 0).tolist()
+    else:
+        starts, durations = _frames_python(kinds, values, fps, offset)
+        backwards = [i for i, duration in enumerate(durations) if duration <= 0]
+
+    for i in backwards:
+        errors.setdefault(i, f'End must be after start: {ranges[i]}')
+    for i in errors:
+        starts[i] = -1
+        durations[i] = -1
+
+    return starts, durations, errors
+
+
+def _frames_python(kinds, values, fps, offset):
+    frames = [v if k else us_to_frame(v, fps) for k, v in zip(kinds, values)]
+    starts = [offset + f for f in frames[0::2]]
+    durations = [end - start for start, end in zip(frames[0::2], frames[1::2])]
+    return starts, durations
+
+
+def _frames_numpy(np, kinds, values, fps, offset):
+    is_frames = np.frombuffer(bytes(kinds), dtype=np.uint8).astype(bool)
+    raw = np.array(values, dtype=np.int64)
+    # Same exact rounding as us_to_frame; int64 holds ~48 hours at 120fps
+    num, den = fps.numerator, fps.denominator * US_PER_SECOND
+    frames = np.where(is_frames, raw, (2 * raw * num + den) // (2 * den))
+    starts = frames[0::2] + offset
+    durations = frames[1::2] - frames[0::2]
+    return starts, durations
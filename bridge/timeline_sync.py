@@ -0,0 +1,66 @@
+"""
+Incremental timeline sync
+Diffs the clips already on the target track against the requested
+placements so a re-run only deletes, appends or replaces what changed
+"""
+
+import resolve_batch
+
+
+def read_track(timeline, track_index):
+    """Read (item, path_key, start, duration) for every clip on a video track"""
+    clips = []
+    for item in timeline.GetItemListInTrack('video', track_index) or []:
+        media_item = item.GetMediaPoolItem()
+        clip_path = media_item.GetClipProperty('File Path') if media_item else None
+        key = resolve_batch.path_key(clip_path) if clip_path else None
+        clips.append((item, key, item.GetStart(), item.GetDuration()))
+    return clips
+
+
+def plan_sync(existing, desired, managed_keys):
+    """
+    Work out the minimal edit for a track
+    existing: read_track() output. desired: list of (path_key, start,
+    duration), one per requested clip. Only existing clips whose file is in
+    managed_keys (images this bridge imports) are ever deleted.
+    Returns (keep, append, replace, delete): keep/append/replace are indices
+    into desired, delete is a list of TimelineItems.
+    """
+    # Exact matches stay where they are
+    unmatched = {}
+    for item, key, start, duration in existing:
+        unmatched.setdefault((key, start, duration), []).append(item)
+
+    keep = []
+    changed = []
+    for i, clip in enumerate(desired):
+        items = unmatched.get(clip)
+        if items:
+            items.pop()
+            keep.append(i)
+        else:
+            changed.append(i)
+
+    leftovers = {}
+    for (key, _, _), items in unmatched.items():
+        if key in managed_keys:
+            leftovers.setdefault(key, []).extend(items)
+
+    # Same file at a new position/length is a replace, anything else an append
+    append = []
+    replace = []
+    delete = []
+    for i in changed:
+        items = leftovers.get(desired[i][0])
+        if items:
+            delete.append(items.pop())
+            replace.append(i)
+        else:
+            append.append(i)
+
+    # Managed clips nobody asked for any more
+    for items in leftovers.values():
+        delete.extend(items)
+
+    return keep, append, replace, delete